@@ -33,20 +33,41 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
 import json
 import logging
+import multiprocessing
 import os
 import re
 import sqlite3
+import sys
 import time
 import urllib.request
 
 import sqlite_muninn
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, field
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime, timedelta, tzinfo
+from itertools import islice
 from pathlib import Path
 from textwrap import dedent
-from typing import Any, Literal
+from typing import Any, Literal, TextIO
+
+# orjson is an optional speed-up, not a dependency (ADR-007): JSON decoding
+# and json/jsonl output use it when the environment already has it and fall
+# back to the stdlib otherwise. It is deliberately absent from the PEP 723
+# block above, so under the documented ``uv run`` entry point the stdlib
+# path is the one that runs; the orjson path needs it installed separately
+# (e.g. ``uv run --with orjson``).
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    _HAS_ORJSON = False
+else:
+    _HAS_ORJSON = True
 
 
 # ============================================================================
@@ -72,7 +93,25 @@ log = logging.getLogger(__name__)
 #   parity (producing identical summary rows) is G11; this is the DDL mirror.
 # v19 (Summariser G3): rollup_summaries table mirrored from the backend schema
 #   (same DDL-mirror rationale as v18).
-SCHEMA_VERSION = "20"
+# v21 (query-performance pass): one coordinated bump for the whole set below.
+#   It is a single version because both ingesters share this cache file: a
+#   version either side doesn't know makes needs_rebuild() reset() the DB on
+#   every alternating run. The backend schema must ship the same DDL under the
+#   same version in the same release (ADR-002/ADR-003).
+#   - session-scoped covering indexes for traverse edge walks and --summary
+#   - source_files.content_hash so an mtime-only change skips re-ingest
+#   - events_au FTS trigger narrowed to UPDATE OF message_content
+#   - trigger-maintained table_counts for events/event_edges
+#   - partial indexes for subagent roots / main-thread tool results
+#   - events.timestamp_ms / sessions.last_timestamp_ms generated columns for
+#     integer time-range filters
+#   - idx_events_rollup_cover for the projects/sessions aggregate rebuild
+#   - events_ai FTS trigger dropped; update() indexes new events in bulk
+#   - idx_sessions_project_last (project_id, last_timestamp_ms) so cmd_sessions
+#     reads in order without a sort; it replaces idx_sessions_project
+#   - idx_events_session, idx_events_project and idx_events_project_session
+#     dropped: each is a leftmost prefix of a covering index above
+SCHEMA_VERSION = "21"
 
 # Sentinel key in cache_metadata used to gate the one-shot (session_id, uuid)
 # dedupe migration. Mirrors DEDUPE_SESSION_UUID_MIGRATION_KEY in
@@ -81,6 +120,17 @@ SCHEMA_VERSION = "20"
 # and the other becomes a no-op.
 DEDUPE_SESSION_UUID_MIGRATION_KEY = "dedupe_session_uuid_v1"
 
+# cache_metadata key holding the highest events.id already in events_fts.
+# events.id is AUTOINCREMENT, so everything above it is still unindexed.
+EVENTS_FTS_WATERMARK_KEY = "events_fts_max_id"
+
+# cache_metadata key holding {session_id: project_id} for sessions whose
+# ingest has committed but whose post-ingest pass (bridge edges, aggregates)
+# hasn't finished yet. update() commits in file batches, so an interrupted
+# run leaves its committed files looking current; the next run picks their
+# sessions up from here instead of never revisiting them.
+PENDING_SESSIONS_KEY = "pending_post_ingest_sessions"
+
 
 # ============================================================================
 # Pricing Configuration
@@ -116,12 +166,32 @@ PRICING = {
 }
 
 
+# Per-family (token_rate, output_mult, cache_read_mult, cache_write_mult),
+# derived once from PRICING so the per-event cost path is a single lookup
+# plus one multiply-add instead of re-deriving the ratios for every row.
+_PRICING_COEFFS: dict[str, tuple[float, float, float, float]] = {
+    family: (
+        p["input"],
+        p["output"] / p["input"],  # always 5.0
+        p["cache_read_multiplier"],  # always 0.1
+        p["cache_write_multiplier"],  # always 1.25
+    )
+    for family, p in PRICING.items()
+}
+
+
+_MODEL_FAMILIES: tuple[str, ...] = ("fable", "opus", "sonnet", "haiku")
+
+
+# Called once per ingested event, but a cache only ever sees a handful of
+# distinct model ids, so memoize the lowercase + substring scan.
+@functools.lru_cache(maxsize=256)
 def model_family_from_id(model_id: str | None) -> str:
     """Extract model family (fable/opus/sonnet/haiku) from a full model ID string."""
     if model_id is None:
         return "unknown"
     model_lower = model_id.lower()
-    for family in ("fable", "opus", "sonnet", "haiku"):
+    for family in _MODEL_FAMILIES:
         if family in model_lower:
             return family
     return "unknown"
@@ -146,17 +216,11 @@ def _compute_event_costs(
     cache_write 1.25×), so token_rate alone is sufficient to reconstruct the full cost.
     Events with an unknown model (no model_id) return (0.0, 0.0, 0.0).
     """
-    family = model_family_from_id(model_id)
-    pricing = PRICING.get(family)
-
-    if pricing is None:
+    coeffs = _PRICING_COEFFS.get(model_family_from_id(model_id))
+    if coeffs is None:
         return 0.0, 0.0, 0.0
 
-    token_rate = pricing["input"]
-    output_mult = pricing["output"] / pricing["input"]  # always 5.0
-    cache_read_mult = pricing["cache_read_multiplier"]  # always 0.1
-    cache_write_mult = pricing["cache_write_multiplier"]  # always 1.25
-
+    token_rate, output_mult, cache_read_mult, cache_write_mult = coeffs
     billable = (
         input_tokens
         + output_tokens * output_mult
@@ -184,14 +248,18 @@ CONTEXT_WINDOWS: dict[str, int] = {
 }
 
 
+# Longest-key-first so a shorter key can't shadow a more specific
+# superstring key (e.g. "opus-4-5" must not win over "opus-4-50").
+_CONTEXT_WINDOW_KEYS: tuple[str, ...] = tuple(sorted(CONTEXT_WINDOWS, key=len, reverse=True))
+
+
+@functools.lru_cache(maxsize=256)
 def context_window(model_id: str | None) -> int | None:
     """Resolve a model id to its context-window size, or None if unknown."""
     if not model_id:
         return None
     low = model_id.lower()
-    # Longest-key-first so a shorter key can't shadow a more specific
-    # superstring key (e.g. "opus-4-5" must not win over "opus-4-50").
-    for key in sorted(CONTEXT_WINDOWS, key=len, reverse=True):
+    for key in _CONTEXT_WINDOW_KEYS:
         if key in low:
             return CONTEXT_WINDOWS[key]
     return None
@@ -209,6 +277,27 @@ def context_ratio(tokens: int, window: int | None) -> float | None:
     return tokens / window
 
 
+@functools.lru_cache(maxsize=4096)
+def _local_tz_at_minute(epoch_minute: int) -> tzinfo | None:
+    """Local timezone (fixed offset) in effect during one UTC minute.
+
+    ``datetime.astimezone()`` with no argument resolves the system zone via
+    localtime() on every call. Zone and DST transitions only happen on whole
+    minutes, so every instant within a minute shares one offset and the
+    lookup can be done once per minute of log instead of once per event.
+    """
+    return datetime.fromtimestamp(epoch_minute * 60, UTC).astimezone().tzinfo
+
+
+def _local_isoformat(timestamp: str) -> str | None:
+    """``timestamp`` converted to the local zone as ISO-8601, or None if unparsable."""
+    try:
+        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+    return dt.astimezone(_local_tz_at_minute(int(dt.timestamp() // 60))).isoformat()
+
+
 # "Too-fast" reply detection (G5): flag a human reply that arrived faster than
 # even a fast skim of the assistant's response could be read. READ_TOKENS_PER_SEC
 # ≈ 480 wpm fast-skim (~0.75 words/token); the min-token floor prevents flagging
@@ -217,6 +306,24 @@ READ_TOKENS_PER_SEC = 8
 TOO_FAST_MIN_TOKENS = 200
 
 
+def _json_loads(text: str | bytes) -> Any:
+    """Decode JSON with orjson when installed, else with the stdlib decoder.
+
+    The stdlib decoder is the default (orjson is not a declared dependency).
+    When orjson is present it is several times faster on the per-line ingest
+    and per-row query paths, but rejects a few inputs the stdlib accepts (lone surrogate
+    escapes, NaN/Infinity). Those fall through to ``json.loads`` so nothing
+    that used to parse is dropped; a genuinely malformed document still
+    raises ``json.JSONDecodeError``.
+    """
+    if not _HAS_ORJSON:
+        return json.loads(text)
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
 def _delta_ms(start_iso: str | None, end_iso: str | None) -> int | None:
     """Milliseconds between two ISO-8601 timestamps, or None if either is
     missing/unparseable or the span is negative (clock skew). Shared by the
@@ -330,6 +437,10 @@ _RULE_PATH_RE = re.compile(r"Contents of\s+(/[^\s:'\"]+)")
 # alternations at once — each alternation must be a distinct literal.
 _SHELL_SPLIT_RE = re.compile(r"\|\||&&|;|\|")
 
+# Relative --since/--until values such as "30m", "2h", "7d", "1w".
+_REL_TIME_RE = re.compile(r"^(\d+)([mhdw])$")
+_REL_TIME_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
 # Command "wrappers" whose first positional argument is itself a command.
 # We skip past them (and any of their flags) to find the real program head.
 _WRAPPERS: frozenset[str] = frozenset(
@@ -797,7 +908,8 @@ CREATE TABLE IF NOT EXISTS source_files (
     last_ingested_at TEXT NOT NULL,
     project_id TEXT NOT NULL,
     session_id TEXT,  -- NULL for orphan agent files
-    file_type TEXT NOT NULL CHECK (file_type IN ('main_session', 'subagent', 'agent_root'))
+    file_type TEXT NOT NULL CHECK (file_type IN ('main_session', 'subagent', 'agent_root')),
+    content_hash TEXT  -- blake2b-128 of the file bytes; NULL if ingested without one
 );
 
 CREATE INDEX IF NOT EXISTS idx_source_files_project ON source_files(project_id);
@@ -823,6 +935,11 @@ CREATE TABLE IF NOT EXISTS sessions (
     project_id TEXT NOT NULL,
     first_timestamp TEXT,
     last_timestamp TEXT,
+    -- Epoch milliseconds of last_timestamp, derived like events.timestamp_ms
+    -- so cmd_sessions' --since compares instants, not ISO strings.
+    last_timestamp_ms INTEGER GENERATED ALWAYS AS (
+        CAST(ROUND((julianday(last_timestamp) - 2440587.5) * 86400000) AS INTEGER)
+    ) STORED,
     event_count INTEGER DEFAULT 0,
     subagent_count INTEGER DEFAULT 0,
     total_input_tokens INTEGER DEFAULT 0,
@@ -837,8 +954,10 @@ CREATE TABLE IF NOT EXISTS sessions (
     UNIQUE(project_id, session_id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_sessions_project ON sessions(project_id);
 CREATE INDEX IF NOT EXISTS idx_sessions_last_timestamp ON sessions(last_timestamp);
+-- cmd_sessions: WHERE project_id = ? ORDER BY last_timestamp_ms DESC LIMIT ?
+-- walks this index backwards and stops at LIMIT instead of sorting.
+CREATE INDEX IF NOT EXISTS idx_sessions_project_last ON sessions(project_id, last_timestamp_ms);
 
 -- Events table: all parsed events
 CREATE TABLE IF NOT EXISTS events (
@@ -850,6 +969,12 @@ CREATE TABLE IF NOT EXISTS events (
     msg_kind TEXT,
     timestamp TEXT,
     timestamp_local TEXT,
+    -- Epoch milliseconds derived from `timestamp`, so --since/--until compare
+    -- integers regardless of how the ISO string was written (Z vs +00:00,
+    -- with or without fractional seconds). NULL when timestamp is.
+    timestamp_ms INTEGER GENERATED ALWAYS AS (
+        CAST(ROUND((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER)
+    ) STORED,
     session_id TEXT,
     project_id TEXT NOT NULL,
     is_sidechain INTEGER DEFAULT 0,
@@ -883,13 +1008,12 @@ CREATE INDEX IF NOT EXISTS idx_events_uuid ON events(uuid);
 CREATE INDEX IF NOT EXISTS idx_events_request_id ON events(request_id);
 CREATE INDEX IF NOT EXISTS idx_events_parent_uuid ON events(parent_uuid);
 CREATE INDEX IF NOT EXISTS idx_events_prompt_id ON events(prompt_id);
-CREATE INDEX IF NOT EXISTS idx_events_session ON events(session_id);
-CREATE INDEX IF NOT EXISTS idx_events_project ON events(project_id);
 CREATE INDEX IF NOT EXISTS idx_events_type ON events(event_type);
 CREATE INDEX IF NOT EXISTS idx_events_msg_kind ON events(msg_kind);
 CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp);
 CREATE INDEX IF NOT EXISTS idx_events_source_file ON events(source_file_id);
 CREATE INDEX IF NOT EXISTS idx_events_session_ts ON events(session_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_session_ts_ms ON events(session_id, timestamp_ms);
 
 -- FTS5 virtual table for full-text search on message content
 CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
@@ -898,16 +1022,16 @@ CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
     content_rowid='id'
 );
 
--- Triggers to keep FTS in sync
-CREATE TRIGGER IF NOT EXISTS events_ai AFTER INSERT ON events BEGIN
-    INSERT INTO events_fts(rowid, message_content) VALUES (new.id, new.message_content);
-END;
-
+-- Triggers to keep FTS in sync. There is deliberately no AFTER INSERT
+-- trigger: ingest indexes new rows in bulk (CacheManager._sync_events_fts)
+-- instead of tokenizing inside every per-event INSERT.
 CREATE TRIGGER IF NOT EXISTS events_ad AFTER DELETE ON events BEGIN
     INSERT INTO events_fts(events_fts, rowid, message_content) VALUES('delete', old.id, old.message_content);
 END;
 
-CREATE TRIGGER IF NOT EXISTS events_au AFTER UPDATE ON events BEGIN
+-- Only re-tokenize when the indexed text itself changes; updates to token,
+-- cost or annotation columns leave the FTS index untouched.
+CREATE TRIGGER IF NOT EXISTS events_au AFTER UPDATE OF message_content ON events BEGIN
     INSERT INTO events_fts(events_fts, rowid, message_content) VALUES('delete', old.id, old.message_content);
     INSERT INTO events_fts(rowid, message_content) VALUES (new.id, new.message_content);
 END;
@@ -930,6 +1054,36 @@ CREATE TABLE IF NOT EXISTS event_edges (
 CREATE INDEX IF NOT EXISTS idx_event_edges_forward ON event_edges(project_id, session_id, event_uuid);
 CREATE INDEX IF NOT EXISTS idx_event_edges_reverse ON event_edges(project_id, session_id, parent_event_uuid);
 CREATE INDEX IF NOT EXISTS idx_event_edges_source_file ON event_edges(source_file_id);
+-- Covering indexes for cmd_traverse's recursive walks, which filter on
+-- session_id alone (no project_id) and so cannot use forward/reverse above.
+CREATE INDEX IF NOT EXISTS idx_event_edges_session_child
+    ON event_edges(session_id, event_uuid, parent_event_uuid);
+CREATE INDEX IF NOT EXISTS idx_event_edges_session_parent
+    ON event_edges(session_id, parent_event_uuid, event_uuid);
+
+-- Exact row counts for `cache status`, maintained by triggers so the status
+-- read is a primary-key lookup rather than a COUNT(*) over the big tables.
+-- Seeded from COUNT(*) on first creation so a cache populated before the
+-- triggers existed starts out correct.
+CREATE TABLE IF NOT EXISTS table_counts (
+    name TEXT PRIMARY KEY,
+    n INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO table_counts (name, n) SELECT 'events', COUNT(*) FROM events;
+INSERT OR IGNORE INTO table_counts (name, n) SELECT 'event_edges', COUNT(*) FROM event_edges;
+
+CREATE TRIGGER IF NOT EXISTS events_count_ai AFTER INSERT ON events BEGIN
+    UPDATE table_counts SET n = n + 1 WHERE name = 'events';
+END;
+CREATE TRIGGER IF NOT EXISTS events_count_ad AFTER DELETE ON events BEGIN
+    UPDATE table_counts SET n = n - 1 WHERE name = 'events';
+END;
+CREATE TRIGGER IF NOT EXISTS event_edges_count_ai AFTER INSERT ON event_edges BEGIN
+    UPDATE table_counts SET n = n + 1 WHERE name = 'event_edges';
+END;
+CREATE TRIGGER IF NOT EXISTS event_edges_count_ad AFTER DELETE ON event_edges BEGIN
+    UPDATE table_counts SET n = n - 1 WHERE name = 'event_edges';
+END;
 
 -- =====================================================================
 -- event_calls — raw fact table for tool/skill/subagent/cli/rule calls
@@ -974,7 +1128,6 @@ CREATE INDEX IF NOT EXISTS idx_event_calls_project_session
 
 
 -- Composite indexes on existing tables for common query patterns
-CREATE INDEX IF NOT EXISTS idx_events_project_session ON events(project_id, session_id);
 CREATE INDEX IF NOT EXISTS idx_events_session_type ON events(session_id, event_type);
 CREATE INDEX IF NOT EXISTS idx_events_session_uuid ON events(session_id, uuid);
 CREATE INDEX IF NOT EXISTS idx_source_files_project_session ON source_files(project_id, session_id);
@@ -986,6 +1139,35 @@ CREATE INDEX IF NOT EXISTS idx_events_covering ON events(
     cache_read_tokens, cache_creation_tokens, total_cost_usd
 );
 
+-- Covering index for traverse --summary (per-agent GROUP BY within one
+-- session): the whole aggregate is answered from the index, in group order.
+CREATE INDEX IF NOT EXISTS idx_events_session_agent_cover ON events(
+    session_id, agent_id, agent_slug, is_sidechain, timestamp,
+    input_tokens, output_tokens, cache_read_tokens, cache_creation_tokens,
+    billable_tokens, total_cost_usd, project_id
+);
+
+-- Covering index for rebuild_aggregates: both the projects and the sessions
+-- GROUP BY stream (project_id, session_id) groups straight off the index
+-- instead of visiting every events row. Its (project_id, session_id) prefix
+-- also serves the plain project/session lookups, and idx_events_session_ts
+-- et al. lead with session_id, so no single-column twins are kept.
+CREATE INDEX IF NOT EXISTS idx_events_rollup_cover ON events(
+    project_id, session_id, agent_id, timestamp,
+    input_tokens, output_tokens, cache_read_tokens, cache_creation_tokens,
+    total_cost_usd
+);
+
+-- Partial indexes for build_cross_agent_edges' per-session lookups. Only a
+-- small fraction of events are subagent roots or main-thread tool results,
+-- so these stay tiny compared to the full single-column indexes.
+CREATE INDEX IF NOT EXISTS idx_events_subagent_roots
+    ON events(session_id, prompt_id, uuid, agent_id, source_file_id)
+    WHERE parent_uuid IS NULL AND agent_id IS NOT NULL AND is_sidechain = 1;
+CREATE INDEX IF NOT EXISTS idx_events_main_tool_results
+    ON events(session_id, prompt_id, parent_uuid)
+    WHERE msg_kind = 'tool_result' AND agent_id IS NULL;
+
 -- =====================================================================
 -- Dimensional aggregation tables (star schema)
 -- =====================================================================
@@ -1602,9 +1784,8 @@ def sync_embeddings(conn: sqlite3.Connection) -> int:
 # --- KG imports (union of all kg/* module imports, project-internal stripped)
 from collections import defaultdict
 from datetime import UTC, datetime
-from gliner2 import GLiNER2
-from huggingface_hub import snapshot_download
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Any
 from typing import TypedDict
 import json
@@ -1614,6 +1795,11 @@ import sqlite3
 import time
 import urllib.request
 
+# gliner2 drags in torch + transformers (seconds of import time); only the
+# KG NER/RE phase needs it, so it is imported inside get_gliner2().
+if TYPE_CHECKING:
+    from gliner2 import GLiNER2
+
 
 # ---------------------------------------------------------------------------
 # kg/runtime.py
@@ -1858,6 +2044,9 @@ def get_gliner2(model_name: str = DEFAULT_GLINER2_MODEL) -> GLiNER2:
     instance with no additional memory or disk I/O.
     """
     if model_name not in _cache:
+        from gliner2 import GLiNER2
+        from huggingface_hub import snapshot_download
+
         log.info("  loading GLiNER2 weights: %s", model_name)
         try:
             local_path = snapshot_download(model_name, local_files_only=True)
@@ -2231,6 +2420,11 @@ def sync_ner_re(conn: sqlite3.Connection) -> tuple[int, int]:
         )
         chunks = chunks[:cap]
 
+    # GLiNER2 pads each batch to its longest text; grouping similar lengths
+    # keeps one long chunk from inflating compute for its batch-mates. Rows
+    # are keyed by chunk_id so processing order does not matter.
+    chunks.sort(key=lambda c: len(c[1]))
+
     log.info(
         "  NER+RE processing %d chunks via GLiNER2 (fastino/gliner2-base-v1)",
         len(chunks),
@@ -2825,29 +3019,106 @@ def sync_kg(conn: sqlite3.Connection) -> KGSyncResult:
 # ============================================================================
 
 
+# (events, line_count, detected_session_id, content_hash) for one JSONL file.
+ParsedSourceFile = tuple[list[dict[str, Any]], int, str | None, str]
+
+# Below this many changed files (the usual incremental update) worker
+# start-up costs more than it saves; cold rebuilds clear it easily.
+PARALLEL_PARSE_MIN_FILES = 32
+PARALLEL_PARSE_MAX_WORKERS = 8
+# Parses in flight per worker: enough to keep workers busy while the writer
+# ingests, without buffering the whole batch's parsed rows.
+PARALLEL_PARSE_WINDOW_PER_WORKER = 2
+
+# Files ingested per transaction in update(). Each commit lets the WAL
+# auto-checkpoint, so a cold rebuild doesn't accumulate the whole database
+# in the -wal before its single final commit.
+INGEST_COMMIT_EVERY = 100
+
+# Rows per multi-row INSERT statement in ingest_file.
+INSERT_BATCH_ROWS = 500
+
+
+@functools.lru_cache(maxsize=256)
+def _multirow_insert_sql(insert_sql: str, width: int, n_rows: int) -> str:
+    """Append ``n_rows`` groups of ``width`` placeholders to ``insert_sql``.
+
+    Memoised so every full batch reuses one string object: no rebuilding the
+    placeholder list per statement, and sqlite3's statement cache hits on a
+    string whose hash is already computed.
+    """
+    row_placeholders = "(" + ",".join("?" * width) + ")"
+    return insert_sql + ",".join([row_placeholders] * n_rows)
+
+
+def _parse_source_file(file_info: dict[str, Any]) -> ParsedSourceFile | None:
+    """Module-level (picklable) entry point for parsing a file in a worker."""
+    return CacheManager().parse_source_file(file_info)
+
+
+def _file_content_hash(filepath: str) -> str:
+    """Return the blake2b-128 hex digest of a file, streamed in 1 MiB blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, "rb") as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 class CacheManager:
     """Manages the SQLite cache for session data."""
 
+    # Applied once per connection. The cmd_* query paths are read-heavy
+    # bursts (sorts in search/traverse, range scans over events), so give
+    # SQLite a 64 MiB page cache, in-memory temp b-trees for ORDER BY /
+    # GROUP BY, and a 256 MiB mmap window. WAL + synchronous=NORMAL keeps
+    # readers unblocked while the backend ingester writes the same file.
+    _CONNECTION_PRAGMAS: tuple[str, ...] = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA cache_size = -65536",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA mmap_size = 268435456",
+        # Bound the row sample ANALYZE / PRAGMA optimize read per index.
+        "PRAGMA analysis_limit = 400",
+    )
+
     def __init__(self, db_path: Path = CACHE_DB_PATH):
         self.db_path = db_path
         self._conn: sqlite3.Connection | None = None
+        # Set by ensure_cache() once the schema/version/migration checks have
+        # passed on this connection, so repeat cmd_* calls in the same process
+        # skip them. Cleared on close() since the file may change underneath.
+        self._ensured = False
 
     @property
     def conn(self) -> sqlite3.Connection:
         """Get or create database connection."""
         if self._conn is None:
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
-            self._conn = sqlite3.connect(str(self.db_path))
+            # The stdlib default of 128 cached statements is smaller than the
+            # set a full update + KG pipeline cycles through, which would evict
+            # and re-prepare the per-file ingest statements.
+            self._conn = sqlite3.connect(str(self.db_path), cached_statements=512)
             self._conn.row_factory = sqlite3.Row
             # Enable foreign keys
             self._conn.execute("PRAGMA foreign_keys = ON")
+            for pragma in self._CONNECTION_PRAGMAS:
+                self._conn.execute(pragma)
         return self._conn
 
     def close(self) -> None:
         """Close database connection."""
         if self._conn:
+            # Recommended before closing short-lived connections: re-analyzes
+            # only tables whose stats drifted, and is a no-op otherwise.
+            try:
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.OperationalError:
+                pass  # e.g. database locked by a concurrent writer
             self._conn.close()
             self._conn = None
+        self._ensured = False
 
     def init_schema(self) -> None:
         """Initialize database schema."""
@@ -2886,64 +3157,93 @@ class CacheManager:
         """
         log.info("Resetting cache database...")
         self.close()
-        if self.db_path.exists():
-            self.db_path.unlink()
+        # WAL mode leaves -wal/-shm sidecars next to the database; a stale
+        # -wal would be replayed into the fresh file, so remove them too.
+        for path in (
+            self.db_path,
+            self.db_path.with_name(self.db_path.name + "-wal"),
+            self.db_path.with_name(self.db_path.name + "-shm"),
+        ):
+            if path.exists():
+                path.unlink()
         self.init_schema()
 
     def clear(self) -> None:
         """Clear all cached data. Safe to call even if tables don't exist."""
         log.info("Clearing cache...")
-        # Use DELETE FROM with IF EXISTS check via try/except for each table
-        tables_to_clear = [
-            "event_edges",  # FK → source_files
-            "event_calls",  # FK → events (must precede `events`)
-            "events",
-            "sessions",
-            "projects",
-            "source_files",
-            "events_fts",
-        ]
-        for table in tables_to_clear:
-            try:
-                self.conn.execute(f"DELETE FROM {table}")
-            except sqlite3.OperationalError:
-                # Table doesn't exist yet, that's fine
-                pass
+        # The per-row triggers on events/event_edges (FTS 'delete', which
+        # re-tokenizes every message, and the table_counts bookkeeping) make a
+        # full DELETE cost far more than the delete itself. Drop them for the
+        # duration, wipe the FTS index in one 'delete-all', and put them back —
+        # all in one transaction so a failure leaves the triggers intact.
+        self.conn.commit()
+        self.conn.execute("BEGIN")
         try:
+            triggers = self.conn.execute(
+                "SELECT name, sql FROM sqlite_master "
+                "WHERE type = 'trigger' AND tbl_name IN ('events', 'event_edges')"
+            ).fetchall()
+            for name, _sql in triggers:
+                self.conn.execute(f'DROP TRIGGER "{name}"')
+
+            # Only touch tables that exist: one sqlite_master probe instead of
+            # an OperationalError raised and caught per missing table.
+            existing = self._existing_tables()
+            tables_to_clear = [
+                "event_edges",  # FK → source_files
+                "event_calls",  # FK → events (must precede `events`)
+                "events",
+                "sessions",
+                "projects",
+                "source_files",
+            ]
+            for table in tables_to_clear:
+                if table in existing:
+                    self.conn.execute(f"DELETE FROM {table}")
+            if "events_fts" in existing:
+                self.conn.execute("INSERT INTO events_fts(events_fts) VALUES ('delete-all')")
+            if "table_counts" in existing:
+                self.conn.execute(
+                    "UPDATE table_counts SET n = 0 WHERE name IN ('events', 'event_edges')"
+                )
+            for _name, sql in triggers:
+                self.conn.execute(sql)
+        except BaseException:
+            self.conn.rollback()
+            raise
+        if "cache_metadata" in existing:
             self.conn.execute(
                 "INSERT OR REPLACE INTO cache_metadata (key, value) VALUES (?, ?)",
                 ("last_cleared_at", datetime.now(UTC).isoformat()),
             )
-        except sqlite3.OperationalError:
-            # cache_metadata table doesn't exist yet
-            pass
         self.conn.commit()
         log.info("Cache cleared")
 
+    def _existing_tables(self) -> frozenset[str]:
+        """Names of the tables (including virtual tables) currently in the DB."""
+        return frozenset(
+            row[0]
+            for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        )
+
     def get_status(self) -> dict[str, Any]:
         """Get cache status information."""
         cursor = self.conn.cursor()
+        existing = self._existing_tables()
 
-        # Get counts
-        file_count = cursor.execute("SELECT COUNT(*) FROM source_files").fetchone()[0]
-        project_count = cursor.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
-        session_count = cursor.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
-        event_count = cursor.execute("SELECT COUNT(*) FROM events").fetchone()[0]
-
-        # Get counts for new tables (with backward compat)
-        edge_count = 0
-        try:
-            edge_count = cursor.execute("SELECT COUNT(*) FROM event_edges").fetchone()[0]
-        except sqlite3.OperationalError:
-            pass  # Tables may not exist in older schema
-
-        # Get metadata
-        created_at = cursor.execute(
-            "SELECT value FROM cache_metadata WHERE key = 'created_at'"
-        ).fetchone()
-        last_update = cursor.execute(
-            "SELECT value FROM cache_metadata WHERE key = 'last_update_at'"
+        # Small-table counts and metadata in one statement
+        file_count, project_count, session_count, created_at, last_update = cursor.execute(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM source_files),
+                (SELECT COUNT(*) FROM projects),
+                (SELECT COUNT(*) FROM sessions),
+                (SELECT value FROM cache_metadata WHERE key = 'created_at'),
+                (SELECT value FROM cache_metadata WHERE key = 'last_update_at')
+            """
         ).fetchone()
+        event_count = self._table_count(cursor, "events", existing)
+        edge_count = self._table_count(cursor, "event_edges", existing)
 
         # Get database file size
         db_size = self.db_path.stat().st_size if self.db_path.exists() else 0
@@ -2957,29 +3257,58 @@ class CacheManager:
             "sessions": session_count,
             "events": event_count,
             "event_edges": edge_count,
-            "created_at": created_at[0] if created_at else None,
-            "last_update_at": last_update[0] if last_update else None,
+            "created_at": created_at,
+            "last_update_at": last_update,
         }
 
+    @staticmethod
+    def _table_count(cursor: sqlite3.Cursor, table: str, existing: frozenset[str]) -> int:
+        """Row count for ``table`` from the trigger-maintained table_counts,
+        falling back to COUNT(*) on caches created before v21."""
+        if table not in existing:
+            return 0  # Tables may not exist in older schema
+        if "table_counts" in existing:
+            row = cursor.execute("SELECT n FROM table_counts WHERE name = ?", (table,)).fetchone()
+            if row is not None:
+                return int(row[0])
+        return int(cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+
     def discover_files(self, projects_path: Path) -> list[dict[str, Any]]:
-        """Discover all JSONL files and classify them."""
+        """Discover all JSONL files and classify them.
+
+        Walks each project with an explicit os.scandir stack rather than
+        ``Path.rglob``: entry types come from the readdir d_type, and the
+        relative path parts are carried down the walk instead of being
+        rebuilt with ``relative_to`` for every file. Like rglob, symlinked
+        directories are not descended into.
+        """
         files: list[dict[str, Any]] = []
 
-        if not projects_path.exists():
+        try:
+            with os.scandir(projects_path) as it:
+                project_entries = [entry for entry in it if entry.is_dir()]
+        except OSError:
             return files
 
-        for project_dir in projects_path.iterdir():
-            if not project_dir.is_dir():
-                continue
-
-            project_id = project_dir.name
-
-            for jsonl_file in project_dir.rglob("*.jsonl"):
-                rel_path = jsonl_file.relative_to(project_dir)
-                parts = rel_path.parts
+        for project_entry in project_entries:
+            project_id = project_entry.name
+            jsonl_files: list[tuple[str, tuple[str, ...]]] = []
+            stack: list[tuple[str, tuple[str, ...]]] = [(project_entry.path, ())]
+            while stack:
+                dir_path, rel_dir = stack.pop()
+                try:
+                    with os.scandir(dir_path) as it:
+                        for entry in it:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append((entry.path, (*rel_dir, entry.name)))
+                            elif entry.name.endswith(".jsonl") and entry.is_file():
+                                jsonl_files.append((entry.path, (*rel_dir, entry.name)))
+                except OSError:
+                    continue
 
+            for filepath, parts in jsonl_files:
                 file_info = {
-                    "filepath": str(jsonl_file),
+                    "filepath": filepath,
                     "project_id": project_id,
                     "session_id": None,
                     "file_type": "unknown",
@@ -3015,9 +3344,24 @@ class CacheManager:
         return files
 
     def get_files_needing_update(self, files: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        """Filter files to only those that need updating."""
+        """Filter files to only those that need updating.
+
+        Unchanged (mtime, size) is the fast path. When only the mtime moved
+        (git checkout, ``cp -p``, an editor save with no edits) the content
+        hash decides: if it still matches, the stored mtime is refreshed in
+        place and the file is not re-parsed.
+        """
         cursor = self.conn.cursor()
         needs_update: list[dict[str, Any]] = []
+        mtime_refreshed = 0
+
+        # One pass over source_files instead of a lookup per discovered file.
+        cached_files: dict[str, sqlite3.Row] = {
+            row["filepath"]: row
+            for row in cursor.execute(
+                "SELECT id, filepath, mtime, size_bytes, content_hash FROM source_files"
+            )
+        }
 
         for file_info in files:
             filepath = file_info["filepath"]
@@ -3030,10 +3374,7 @@ class CacheManager:
                 continue
 
             # Check if file is in cache with same mtime
-            cached = cursor.execute(
-                "SELECT mtime, size_bytes FROM source_files WHERE filepath = ?",
-                (filepath,),
-            ).fetchone()
+            cached = cached_files.get(filepath)
 
             if cached is None:
                 # New file
@@ -3042,53 +3383,62 @@ class CacheManager:
                 file_info["reason"] = "new"
                 needs_update.append(file_info)
             elif cached["mtime"] != current_mtime or cached["size_bytes"] != current_size:
+                if cached["size_bytes"] == current_size and cached["content_hash"] is not None:
+                    try:
+                        content_hash = _file_content_hash(filepath)
+                    except OSError:
+                        continue
+                    if content_hash == cached["content_hash"]:
+                        cursor.execute(
+                            "UPDATE source_files SET mtime = ? WHERE id = ?",
+                            (current_mtime, cached["id"]),
+                        )
+                        mtime_refreshed += 1
+                        continue
+                    file_info["content_hash"] = content_hash
                 # Modified file
                 file_info["mtime"] = current_mtime
                 file_info["size_bytes"] = current_size
                 file_info["reason"] = "modified"
                 needs_update.append(file_info)
 
+        if mtime_refreshed:
+            log.info(f"Refreshed mtime on {mtime_refreshed} files with unchanged content")
+            self.conn.commit()
         return needs_update
 
-    def ingest_file(self, file_info: dict[str, Any]) -> int:
-        """Ingest a single JSONL file into the cache. Returns event count."""
+    def parse_source_file(self, file_info: dict[str, Any]) -> ParsedSourceFile | None:
+        """Parse a JSONL file into annotated event rows without touching the database.
+
+        Returns ``(events, line_count, session_id, content_hash)``, or None when
+        the file can't be read. Split out of ``ingest_file`` so ``update`` can
+        run it in worker processes (see ``_parse_source_file``).
+        """
         filepath = file_info["filepath"]
         project_id = file_info["project_id"]
-        session_id = file_info.get("session_id")
         file_type = file_info["file_type"]
-        mtime = file_info["mtime"]
-        size_bytes = file_info["size_bytes"]
-
-        log.debug(f"Ingesting {filepath}")
 
-        cursor = self.conn.cursor()
-
-        # Delete existing data for this file (if re-ingesting)
-        existing = cursor.execute(
-            "SELECT id FROM source_files WHERE filepath = ?", (filepath,)
-        ).fetchone()
-        if existing:
-            cursor.execute("DELETE FROM event_edges WHERE source_file_id = ?", (existing[0],))
-            # event_calls rows are removed via ON DELETE CASCADE when the
-            # parent event row is deleted, so no explicit sweep is needed.
-            cursor.execute("DELETE FROM events WHERE source_file_id = ?", (existing[0],))
-            cursor.execute("DELETE FROM source_files WHERE id = ?", (existing[0],))
-
-        # Parse file and count lines
         events_data: list[dict[str, Any]] = []
         line_count = 0
-        detected_session_id = session_id  # May be updated from file content
+        detected_session_id = file_info.get("session_id")  # May be updated from file content
 
         try:
-            with open(filepath, encoding="utf-8") as f:
+            # Read bytes, not text: _json_loads takes UTF-8 bytes, so the text
+            # layer's decode pass is pure overhead. Binary lines concatenate
+            # back to the exact file bytes, so the content hash is folded
+            # into the same pass instead of re-reading the file afterwards.
+            digest = hashlib.blake2b(digest_size=16) if file_info.get("content_hash") is None else None
+            with open(filepath, "rb") as f:
                 for line_num, line in enumerate(f, start=1):
                     line_count = line_num
+                    if digest is not None:
+                        digest.update(line)
                     line = line.strip()
                     if not line:
                         continue
 
                     try:
-                        raw = json.loads(line)
+                        raw = _json_loads(line)
                     except json.JSONDecodeError:
                         continue
 
@@ -3101,68 +3451,117 @@ class CacheManager:
                     )
                     if event:
                         events_data.append(event)
+            # Reuse the hash get_files_needing_update already computed, if any.
+            content_hash: str = digest.hexdigest() if digest is not None else file_info["content_hash"]
 
         except (FileNotFoundError, PermissionError) as e:
             log.warning(f"Could not read {filepath}: {e}")
-            return 0
+            return None
 
         # Mark response heads + zero duplicated multi-block usage, and stamp
         # response_duration_ms on each head. Must run before the rows are
         # written so the per-event columns reflect the deduped values.
         self._annotate_responses(events_data)
+        return events_data, line_count, detected_session_id, content_hash
+
+    def ingest_file(
+        self,
+        file_info: dict[str, Any],
+        pre_parsed: ParsedSourceFile | None = None,
+        ingested_at: str | None = None,
+    ) -> int:
+        """Ingest a single JSONL file into the cache. Returns event count.
+
+        ``pre_parsed`` is the ``parse_source_file`` result when the caller
+        already parsed the file (e.g. in a worker process). ``ingested_at``
+        is the ``last_ingested_at`` stamp; ``update()`` passes one per run so
+        every file in the batch shares it. Defaults to now.
+        """
+        filepath = file_info["filepath"]
+        project_id = file_info["project_id"]
+        file_type = file_info["file_type"]
+        mtime = file_info["mtime"]
+        size_bytes = file_info["size_bytes"]
+
+        log.debug(f"Ingesting {filepath}")
+
+        cursor = self.conn.cursor()
+        # Every read below is positional, so skip wrapping rows in sqlite3.Row.
+        cursor.row_factory = None
+
+        # Delete existing data for this file (if re-ingesting). events and
+        # event_edges reference source_files ON DELETE CASCADE (and
+        # event_calls cascades from events), so one delete by the UNIQUE
+        # filepath clears every row the file produced.
+        cursor.execute("DELETE FROM source_files WHERE filepath = ?", (filepath,))
+
+        parsed = pre_parsed if pre_parsed is not None else self.parse_source_file(file_info)
+        if parsed is None:
+            return 0
+        events_data, line_count, detected_session_id, content_hash = parsed
 
         # Insert source file record
         cursor.execute(
             """INSERT INTO source_files
                (filepath, mtime, size_bytes, line_count, last_ingested_at,
-                project_id, session_id, file_type)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                project_id, session_id, file_type, content_hash)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
             (
                 filepath,
                 mtime,
                 size_bytes,
                 line_count,
-                datetime.now(UTC).isoformat(),
+                ingested_at or datetime.now(UTC).isoformat(),
                 project_id,
                 detected_session_id,
                 file_type,
+                content_hash,
             ),
         )
         source_file_id = cursor.lastrowid
 
         # Insert events — append-if-not-exists on canonical (session_id, uuid).
         # When the same JSONL is ingested via a second filepath (e.g. an rsync
-        # mirror) the event already lives in the cache — reuse its id and skip
-        # the dependent edges/calls writes below so we don't duplicate them
-        # either. Backed by idx_events_session_uuid.
+        # mirror) the event already lives in the cache — skip it and the
+        # dependent edges/calls writes below so we don't duplicate them
+        # either. The already-cached uuids are resolved in one query (backed
+        # by idx_events_session_uuid) rather than one SELECT per event, and
+        # `seen` also drops repeats within this file.
+        file_uuids = [e["uuid"] for e in events_data if e["uuid"] is not None]
+        seen: set[str] = set()
+        if file_uuids:
+            seen.update(
+                row[0]
+                for row in cursor.execute(
+                    "SELECT uuid FROM events WHERE session_id IS ? "
+                    "AND uuid IN (SELECT value FROM json_each(?))",
+                    (detected_session_id, json.dumps(file_uuids)),
+                )
+            )
+        new_events: list[dict[str, Any]] = []
         for event in events_data:
-            existing_id: int | None = None
-            if event["uuid"] is not None:
-                row = cursor.execute(
-                    "SELECT id FROM events WHERE session_id IS ? AND uuid = ?",
-                    (detected_session_id, event["uuid"]),
-                ).fetchone()
-                if row is not None:
-                    existing_id = row[0]
-
-            if existing_id is not None:
-                event["_db_id"] = existing_id
-                event["_dedup_skip"] = True
-                continue
-
-            cursor.execute(
-                """INSERT INTO events
-                   (uuid, parent_uuid, prompt_id, event_type, msg_kind, timestamp, timestamp_local,
-                    session_id, project_id, is_sidechain, agent_id, agent_slug,
-                    message_role, message_content, message_content_json, model_id,
-                    request_id, stop_reason, is_response_head,
-                    context_tokens, context_window, context_ratio,
-                    response_duration_ms,
-                    input_tokens, output_tokens, cache_read_tokens,
-                    cache_creation_tokens, cache_5m_tokens,
-                    token_rate, billable_tokens, total_cost_usd,
-                    source_file_id, line_number, raw_json)
-                   VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
+            ev_uuid = event["uuid"]
+            if ev_uuid is not None:
+                if ev_uuid in seen:
+                    continue
+                seen.add(ev_uuid)
+            new_events.append(event)
+
+        self._insert_rows(
+            cursor,
+            """INSERT INTO events
+               (uuid, parent_uuid, prompt_id, event_type, msg_kind, timestamp, timestamp_local,
+                session_id, project_id, is_sidechain, agent_id, agent_slug,
+                message_role, message_content, message_content_json, model_id,
+                request_id, stop_reason, is_response_head,
+                context_tokens, context_window, context_ratio,
+                response_duration_ms,
+                input_tokens, output_tokens, cache_read_tokens,
+                cache_creation_tokens, cache_5m_tokens,
+                token_rate, billable_tokens, total_cost_usd,
+                source_file_id, line_number, raw_json)
+               VALUES """,
+            [
                 (
                     event["uuid"],
                     event["parent_uuid"],
@@ -3198,58 +3597,83 @@ class CacheManager:
                     source_file_id,
                     event["line_number"],
                     event["raw_json"],
-                ),
-            )
-            # Capture the rowid so the event_calls insert below can
-            # reference each event's primary key without a second lookup.
-            event["_db_id"] = cursor.lastrowid
-
-        # Insert event edges for parent-child relationships
-        for event in events_data:
-            if event.get("_dedup_skip"):
-                continue
-            if event["uuid"] and event["parent_uuid"]:
-                cursor.execute(
-                    """INSERT INTO event_edges
-                       (project_id, session_id, event_uuid, parent_event_uuid, source_file_id)
-                       VALUES (?, ?, ?, ?, ?)""",
-                    (
-                        project_id,
-                        detected_session_id,
-                        event["uuid"],
-                        event["parent_uuid"],
-                        source_file_id,
-                    ),
                 )
+                for event in new_events
+            ],
+        )
+
+        # Insert event edges for parent-child relationships. They are a pure
+        # projection of the rows just written, so derive them in SQL (via
+        # idx_events_source_file) instead of re-binding every pair from Python.
+        cursor.execute(
+            """INSERT INTO event_edges
+               (project_id, session_id, event_uuid, parent_event_uuid, source_file_id)
+               SELECT project_id, session_id, uuid, parent_uuid, source_file_id
+               FROM events
+               WHERE source_file_id = ?
+                 AND uuid IS NOT NULL AND uuid != ''
+                 AND parent_uuid IS NOT NULL AND parent_uuid != ''
+               ORDER BY id""",
+            (source_file_id,),
+        )
 
         # Fact-table rows for tool/skill/subagent/cli/rule calls. The calls
         # list was attached during _parse_event_for_cache so we're just
-        # fanning out the already-parsed content-block signals here.
-        for event in events_data:
-            if event.get("_dedup_skip"):
-                continue
-            event_db_id = event.get("_db_id")
-            if not event_db_id:
-                continue
-            for ord_, call_type, call_name in event.get("_calls", ()):
+        # fanning out the already-parsed content-block signals here. Each
+        # event occupies one line of this file, so line_number maps a call
+        # back to the rowid the batched insert above assigned to its event.
+        if any(event.get("_calls") for event in new_events):
+            event_ids = dict(
                 cursor.execute(
-                    """INSERT INTO event_calls
-                       (event_id, ord, call_type, call_name,
-                        timestamp, project_id, session_id)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    "SELECT line_number, id FROM events WHERE source_file_id = ?",
+                    (source_file_id,),
+                ).fetchall()
+            )
+            self._insert_rows(
+                cursor,
+                """INSERT INTO event_calls
+                   (event_id, ord, call_type, call_name,
+                    timestamp, project_id, session_id)
+                   VALUES """,
+                [
                     (
-                        event_db_id,
+                        event_ids[event["line_number"]],
                         ord_,
                         call_type,
                         call_name,
                         event["timestamp"],
                         project_id,
                         detected_session_id,
-                    ),
-                )
+                    )
+                    for event in new_events
+                    for ord_, call_type, call_name in event.get("_calls", ())
+                ],
+            )
 
         return len(events_data)
 
+    def _insert_rows(
+        self, cursor: sqlite3.Cursor, insert_sql: str, rows: list[tuple[Any, ...]]
+    ) -> None:
+        """Run ``insert_sql`` (ending in ``VALUES``) as multi-row INSERTs.
+
+        One statement per INSERT_BATCH_ROWS rows instead of one per row, so
+        the per-statement VM setup and index-cursor seeks are paid once per
+        batch. Batches are also capped by the connection's bound-parameter
+        limit.
+        """
+        if not rows:
+            return
+        width = len(rows[0])
+        max_vars = self.conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        per_stmt = max(1, min(INSERT_BATCH_ROWS, max_vars // width))
+        for start in range(0, len(rows), per_stmt):
+            chunk = rows[start : start + per_stmt]
+            cursor.execute(
+                _multirow_insert_sql(insert_sql, width, len(chunk)),
+                [value for row in chunk for value in row],
+            )
+
     # Additive per-event usage measures that downstream SUM()s read. A
     # multi-block response repeats these on every content block, so the
     # post-pass keeps them on the head and zeroes them on the non-heads.
@@ -3329,11 +3753,15 @@ class CacheManager:
 
         # Extract message info
         is_meta = raw.get("isMeta", False)
-        message = raw.get("message", {}) or {}
-        message_role = message.get("role") if isinstance(message, dict) else None
-        stop_reason = message.get("stop_reason") if isinstance(message, dict) else None
-        message_content_raw = message.get("content") if isinstance(message, dict) else None
-        model_id = message.get("model") if isinstance(message, dict) else None
+        # Type-check the message once; a missing or malformed one reads as {}.
+        message = raw.get("message")
+        if not isinstance(message, dict):
+            message = {}
+        message_get = message.get
+        message_role = message_get("role")
+        stop_reason = message_get("stop_reason")
+        message_content_raw = message_get("content")
+        model_id = message_get("model")
 
         # Sanitize: drop `signature` from thinking blocks (large base64 token, useless for analytics)
         if isinstance(message_content_raw, list):
@@ -3359,13 +3787,14 @@ class CacheManager:
         message_content_text = self._extract_text_content(message_content_raw)
 
         # Extract token usage
-        usage = message.get("usage", {}) if isinstance(message, dict) else {}
-        input_tokens = usage.get("input_tokens", 0) or 0
-        output_tokens = usage.get("output_tokens", 0) or 0
-        cache_read_tokens = usage.get("cache_read_input_tokens", 0) or 0
-        cache_creation_tokens = usage.get("cache_creation_input_tokens", 0) or 0
-        cache_creation = usage.get("cache_creation", {}) or {}
-        cache_5m_tokens = cache_creation.get("ephemeral_5m_input_tokens", 0) or 0
+        usage = message_get("usage") or {}
+        usage_get = usage.get
+        input_tokens = usage_get("input_tokens") or 0
+        output_tokens = usage_get("output_tokens") or 0
+        cache_read_tokens = usage_get("cache_read_input_tokens") or 0
+        cache_creation_tokens = usage_get("cache_creation_input_tokens") or 0
+        cache_creation = usage_get("cache_creation") or {}
+        cache_5m_tokens = cache_creation.get("ephemeral_5m_input_tokens") or 0
 
         # Compute cost fields at ingestion time so they are stored in the DB
         token_rate, billable_tokens, total_cost_usd = _compute_event_costs(
@@ -3382,15 +3811,7 @@ class CacheManager:
         ctx_window = context_window(model_id)
         ctx_ratio = context_ratio(ctx_tokens, ctx_window)
 
-        # Compute local timestamp
-        timestamp_local = None
-        if timestamp:
-            try:
-                dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-                local_dt = dt.astimezone()
-                timestamp_local = local_dt.isoformat()
-            except (ValueError, TypeError):
-                pass
+        timestamp_local = _local_isoformat(timestamp) if timestamp else None
 
         return {
             "uuid": uuid,
@@ -3451,23 +3872,32 @@ class CacheManager:
             return content
 
         if isinstance(content, list):
-            parts = []
+            # Runs once per ingested event: read each block's type once and
+            # only keep non-empty parts, rather than filtering a second pass.
+            parts: list[str] = []
+            append = parts.append
             for block in content:
                 if isinstance(block, dict):
-                    if block.get("type") == "text":
-                        parts.append(block.get("text", ""))
-                    elif block.get("type") == "thinking":
-                        parts.append(block.get("thinking", ""))
-                    elif block.get("type") == "tool_use":
-                        parts.append(f"[tool: {block.get('name', '')}]")
-                        inp = block.get("input", {})
+                    block_type = block.get("type")
+                    if block_type == "text":
+                        text = block.get("text")
+                    elif block_type == "thinking":
+                        text = block.get("thinking")
+                    elif block_type == "tool_use":
+                        append(f"[tool: {block.get('name', '')}]")
+                        inp = block.get("input")
                         if isinstance(inp, dict):
                             for v in inp.values():
-                                if isinstance(v, str):
-                                    parts.append(v[:500])  # Limit tool input text
-                elif isinstance(block, str):
-                    parts.append(block)
-            return "\n".join(filter(None, parts))
+                                if v and isinstance(v, str):
+                                    append(v[:500])  # Limit tool input text
+                        continue
+                    else:
+                        continue
+                    if text:
+                        append(text)
+                elif block and isinstance(block, str):
+                    append(block)
+            return "\n".join(parts)
 
         return ""
 
@@ -3570,7 +4000,8 @@ class CacheManager:
                 session_id, project_id, first_timestamp, last_timestamp,
                 event_count, subagent_count,
                 total_input_tokens, total_output_tokens,
-                total_cache_read_tokens, total_cache_creation_tokens
+                total_cache_read_tokens, total_cache_creation_tokens,
+                total_cost_usd
             )
             SELECT
                 session_id,
@@ -3582,26 +4013,18 @@ class CacheManager:
                 SUM(input_tokens) as total_input_tokens,
                 SUM(output_tokens) as total_output_tokens,
                 SUM(cache_read_tokens) as total_cache_read_tokens,
-                SUM(cache_creation_tokens) as total_cache_creation_tokens
+                SUM(cache_creation_tokens) as total_cache_creation_tokens,
+                -- Per-event cost from events.total_cost_usd, populated at
+                -- ingest by _compute_event_costs(). The events column is the
+                -- single source of truth so rollup matches the dashboard
+                -- backend's rebuild_aggregates() — see
+                -- src/claude_code_sessions/database/sqlite/cache.py.
+                COALESCE(SUM(total_cost_usd), 0) as total_cost_usd
             FROM events
             WHERE session_id IS NOT NULL
             GROUP BY project_id, session_id
         """)
 
-        # Sum per-event cost from events.total_cost_usd, which was
-        # populated at ingest by _compute_event_costs(). The events column
-        # is the single source of truth so rollup matches the dashboard
-        # backend's rebuild_aggregates() — see
-        # src/claude_code_sessions/database/sqlite/cache.py.
-        cursor.execute("""
-            UPDATE sessions SET total_cost_usd = (
-                SELECT COALESCE(SUM(e.total_cost_usd), 0)
-                FROM events e
-                WHERE e.session_id = sessions.session_id
-                  AND e.project_id = sessions.project_id
-            )
-        """)
-
         self._compute_session_timing(cursor)
 
         self.conn.commit()
@@ -3879,6 +4302,97 @@ class CacheManager:
             self.conn.commit()
         return created
 
+    def _parse_files(self, files: list[dict[str, Any]]) -> Iterator[ParsedSourceFile | None]:
+        """Yield ``parse_source_file`` results for ``files``, in order.
+
+        JSON decoding is the CPU-bound part of ingest, so large batches are
+        parsed in a process pool while this process stays the only SQLite
+        writer. Results come back in input order, which keeps the
+        first-file-wins (session_id, uuid) dedupe in ``ingest_file``
+        deterministic.
+        """
+        workers = min(os.cpu_count() or 1, PARALLEL_PARSE_MAX_WORKERS)
+        if len(files) < PARALLEL_PARSE_MIN_FILES or workers < 2:
+            yield from map(self.parse_source_file, files)
+            return
+        # fork skips re-importing and re-initialising this module per worker,
+        # but is only safe on Linux; elsewhere (macOS: fork after threads or
+        # Objective-C init) keep the platform's default start method.
+        start_method = "fork" if sys.platform == "linux" else None
+        log.info(f"Parsing {len(files)} files with {workers} workers")
+        pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context(start_method)
+        )
+        try:
+            # Keep at most PARALLEL_PARSE_WINDOW_PER_WORKER parses per worker
+            # in flight, submitted in input order: finished parses wait for
+            # the writer, so an unbounded queue would hold every parsed
+            # file's rows in memory at once.
+            pending: deque[Future[ParsedSourceFile | None]] = deque()
+            remaining = iter(files)
+            window = workers * PARALLEL_PARSE_WINDOW_PER_WORKER
+            for file_info in islice(remaining, window):
+                pending.append(pool.submit(_parse_source_file, file_info))
+            while pending:
+                result = pending.popleft().result()
+                for file_info in islice(remaining, 1):
+                    pending.append(pool.submit(_parse_source_file, file_info))
+                yield result
+        finally:
+            # Also runs when the consumer stops early (an ingest error,
+            # Ctrl-C closing the generator): drop the queued parses rather
+            # than waiting for all of them before the error surfaces.
+            pool.shutdown(cancel_futures=True)
+
+    def _commit_ingest_batch(self, affected_sessions: dict[str, str]) -> None:
+        """Commit ingested rows together with their FTS entries and sessions.
+
+        The touched sessions are stored under ``PENDING_SESSIONS_KEY`` in the
+        same transaction, so a run stopped before its post-ingest pass still
+        gets bridge edges and aggregate windows rebuilt by the next update().
+        """
+        self._sync_events_fts()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cache_metadata (key, value) VALUES (?, ?)",
+            (PENDING_SESSIONS_KEY, json.dumps(affected_sessions)),
+        )
+        self.conn.commit()
+
+    def _sync_events_fts(self) -> int:
+        """Index events inserted since the last sync into events_fts.
+
+        One INSERT ... SELECT tokenizes the whole batch, instead of an AFTER
+        INSERT trigger firing per row inside ingest. Called before every
+        ingest commit so a committed event is always searchable. Returns the
+        number of rows indexed.
+        """
+        row = self.conn.execute(
+            "SELECT value FROM cache_metadata WHERE key = ?", (EVENTS_FTS_WATERMARK_KEY,)
+        ).fetchone()
+        watermark = int(row[0]) if row else 0
+        top = self.conn.execute("SELECT MAX(id) FROM events").fetchone()[0] or 0
+        if top <= watermark:
+            return 0
+        indexed = 0
+        # An older schema on the shared DB may have put the per-row trigger
+        # back; those rows are already indexed, so only move the watermark.
+        if (
+            self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'events_ai'"
+            ).fetchone()
+            is None
+        ):
+            indexed = self.conn.execute(
+                "INSERT INTO events_fts(rowid, message_content) "
+                "SELECT id, message_content FROM events WHERE id > ?",
+                (watermark,),
+            ).rowcount
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cache_metadata (key, value) VALUES (?, ?)",
+            (EVENTS_FTS_WATERMARK_KEY, str(top)),
+        )
+        return indexed
+
     def update(self, projects_path: Path) -> dict[str, Any]:
         """Perform incremental update of the cache. Returns counts."""
         log.info("Starting incremental cache update...")
@@ -3891,7 +4405,14 @@ class CacheManager:
         files_to_update = self.get_files_needing_update(all_files)
         log.info(f"Found {len(files_to_update)} files needing update")
 
-        if not files_to_update:
+        # Sessions an interrupted run committed but never finished (see
+        # PENDING_SESSIONS_KEY); they join this run's post-ingest pass.
+        row = self.conn.execute(
+            "SELECT value FROM cache_metadata WHERE key = ?", (PENDING_SESSIONS_KEY,)
+        ).fetchone()
+        affected_sessions: dict[str, str] = json.loads(row[0]) if row else {}  # session_id → project_id
+
+        if not files_to_update and not affected_sessions:
             log.info("Cache is up to date")
             # Still run downstream syncs — chunks / HNSW may be behind
             # the events table after a schema version bump. Both calls
@@ -3919,19 +4440,26 @@ class CacheManager:
             }
 
         # Ingest updated files, tracking which sessions were touched
+        ingested_at = datetime.now(UTC).isoformat()
         total_events = 0
-        affected_sessions: dict[str, str] = {}  # session_id → project_id
-        for file_info in files_to_update:
-            events_added = self.ingest_file(file_info)
-            total_events += events_added
-            log.debug(
-                f"  {file_info['filepath']}: {events_added} events ({file_info.get('reason', 'new')})"
-            )
-            sid = file_info.get("session_id")
-            if sid:
-                affected_sessions[sid] = file_info["project_id"]
+        for n, (file_info, parsed) in enumerate(
+            zip(files_to_update, self._parse_files(files_to_update), strict=True), start=1
+        ):
+            # parsed is None when the file is unreadable right now (already
+            # logged); keep its cached rows.
+            if parsed is not None:
+                events_added = self.ingest_file(file_info, parsed, ingested_at=ingested_at)
+                total_events += events_added
+                log.debug(
+                    f"  {file_info['filepath']}: {events_added} events ({file_info.get('reason', 'new')})"
+                )
+                sid = file_info.get("session_id")
+                if sid:
+                    affected_sessions[sid] = file_info["project_id"]
+            if n % INGEST_COMMIT_EVERY == 0:
+                self._commit_ingest_batch(affected_sessions)
 
-        self.conn.commit()
+        self._commit_ingest_batch(affected_sessions)
 
         # Build cross-agent bridge edges for every touched session
         total_bridges = 0
@@ -3965,6 +4493,10 @@ class CacheManager:
             if row and row[0]:
                 self.refresh_aggregates_for_range(str(row[0]), str(row[1]))
 
+        # Post-ingest pass done; nothing is left for a later run to finish.
+        self.conn.execute("DELETE FROM cache_metadata WHERE key = ?", (PENDING_SESSIONS_KEY,))
+        self.conn.commit()
+
         # Chunking + embeddings. Incremental; no-op when nothing is stale.
         # First-run embedding downloads ~150 MB GGUF model and processes
         # the backlog — takes minutes. Set the env var to skip in tests
@@ -3987,6 +4519,14 @@ class CacheManager:
             ("last_update_at", datetime.now(UTC).isoformat()),
         )
         self.conn.commit()
+        # Refresh planner statistics for tables whose shape changed enough
+        # to matter, so the covering indexes are picked over the narrower
+        # single-column ones. Cheap no-op when nothing drifted.
+        self.conn.execute("PRAGMA optimize")
+        # A large ingest leaves every written page in the -wal; fold it back
+        # into the main file and truncate it so the WAL doesn't stay at its
+        # high-water mark between runs.
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
 
         log.info(
             f"Updated {len(files_to_update)} files, {total_events} events, "
@@ -4005,7 +4545,7 @@ class CacheManager:
 # ============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionEvent:
     """Represents a single event from a session JSONL file."""
 
@@ -4080,7 +4620,13 @@ def infer_project_id(cache: CacheManager, cwd: Path | None = None) -> str | None
 
 
 def ensure_cache(cache: CacheManager, projects_path: Path | None = None) -> None:
-    """Ensure cache exists and is initialized."""
+    """Ensure cache exists and is initialized.
+
+    The checks run once per open connection; later calls on the same
+    CacheManager return immediately.
+    """
+    if cache._ensured:
+        return
     if projects_path is None:
         projects_path = PROJECTS_PATH
     if not cache.db_path.exists():
@@ -4095,6 +4641,7 @@ def ensure_cache(cache: CacheManager, projects_path: Path | None = None) -> None
         # One-shot data migrations on an existing, current-schema cache.
         # Sentinel-gated in cache_metadata so it's a no-op after first run.
         cache.migrate_dedupe_session_uuid()
+    cache._ensured = True
 
 
 def resolve_project_id(cache: CacheManager, session_id: str) -> str | None:
@@ -4141,6 +4688,9 @@ def cmd_cache_rebuild(cache: CacheManager, projects_path: Path | None = None) ->
         projects_path = PROJECTS_PATH
     cache.reset()
     result = cache.update(projects_path)
+    # A fresh file has no sqlite_stat1 at all; collect full planner stats
+    # once so the first queries after a rebuild pick the covering indexes.
+    cache.conn.execute("ANALYZE")
     result["status"] = "rebuilt"
     return result
 
@@ -4171,7 +4721,7 @@ def cmd_projects(cache: CacheManager) -> list[dict[str, Any]]:
         SELECT project_id, session_count, first_activity, last_activity, event_count
         FROM projects
         ORDER BY last_activity DESC
-    """).fetchall()
+    """)
 
     return [dict(row) for row in results]
 
@@ -4201,13 +4751,13 @@ def cmd_sessions(
     if since:
         since_dt = parse_time_filter(since)
         if since_dt:
-            query += " AND last_timestamp >= ?"
-            params.append(since_dt.isoformat())
+            query += " AND last_timestamp_ms >= ?"
+            params.append(_epoch_ms(since_dt))
 
-    query += " ORDER BY last_timestamp DESC LIMIT ?"
+    query += " ORDER BY last_timestamp_ms DESC LIMIT ?"
     params.append(limit)
 
-    results = cursor.execute(query, params).fetchall()
+    results = cursor.execute(query, params)
     return [dict(row) for row in results]
 
 
@@ -4253,38 +4803,48 @@ def cmd_search(
     # Escape plain-text pattern for FTS5 query syntax
     fts_pattern = _escape_fts5_query(pattern)
 
-    # Use FTS5 for search
-    query = """
-        SELECT
-            e.uuid, e.project_id, e.session_id, e.event_type, e.timestamp,
-            SUBSTR(e.message_content, 1, 200) as content_preview,
-            sf.filepath, e.line_number
-        FROM events e
-        JOIN events_fts fts ON e.id = fts.rowid
-        JOIN source_files sf ON e.source_file_id = sf.id
+    # Use FTS5 for search. The inner query only filters the hits and keeps
+    # the newest `limit` ids; the preview SUBSTR and the source_files join run
+    # in the outer query for just the LIMIT survivors, so the sort carries
+    # narrow rows no matter how many events match.
+    hits_query = """
+        SELECT e.id, e.timestamp
+        FROM events_fts fts
+        JOIN events e ON e.id = fts.rowid
         WHERE events_fts MATCH ?
     """
     params: list[Any] = [fts_pattern]
 
     if project_id:
-        query += " AND e.project_id = ?"
+        hits_query += " AND e.project_id = ?"
         params.append(project_id)
 
     if event_types:
         placeholders = ",".join("?" * len(event_types))
-        query += f" AND e.msg_kind IN ({placeholders})"
+        hits_query += f" AND e.msg_kind IN ({placeholders})"
         params.extend(event_types)
 
     if since:
         since_dt = parse_time_filter(since)
         if since_dt:
-            query += " AND e.timestamp >= ?"
-            params.append(since_dt.strftime("%Y-%m-%dT%H:%M:%S"))
+            hits_query += " AND e.timestamp_ms >= ?"
+            params.append(_epoch_ms(since_dt))
 
-    query += " ORDER BY e.timestamp DESC LIMIT ?"
+    hits_query += " ORDER BY e.timestamp DESC LIMIT ?"
     params.append(limit)
 
-    results = cursor.execute(query, params).fetchall()
+    query = f"""
+        SELECT
+            e.uuid, e.project_id, e.session_id, e.event_type, e.timestamp,
+            SUBSTR(e.message_content, 1, 200) as content_preview,
+            sf.filepath, e.line_number
+        FROM ({hits_query}) hits
+        JOIN events e ON e.id = hits.id
+        JOIN source_files sf ON e.source_file_id = sf.id
+        ORDER BY hits.timestamp DESC
+    """
+
+    results = cursor.execute(query, params)
     return [dict(row) for row in results]
 
 
@@ -4320,20 +4880,71 @@ def cmd_event(
     # Parse content JSON if present
     if row.get("message_content_json"):
         try:
-            row["message_content"] = json.loads(row["message_content_json"])
+            row["message_content"] = _json_loads(row["message_content_json"])
         except json.JSONDecodeError:
             pass
 
     # Parse raw JSON
     if row.get("raw_json"):
         try:
-            row["message_json"] = json.loads(row["raw_json"])
+            row["message_json"] = _json_loads(row["raw_json"])
         except json.JSONDecodeError:
             row["message_json"] = None
 
     return row
 
 
+def _timeline_bound(op: Literal[">", ">=", "<="], timestamp: str | None, row_id: int) -> tuple[str, list[Any]]:
+    """SQL predicate placing ``e`` on one side of a row in a session timeline.
+
+    Timelines are ordered by ``e.timestamp, e.id``: SQLite sorts NULL
+    timestamps (summary events) first, and the rowid breaks ties, so the order
+    is total. A non-NULL boundary uses the row-value form so
+    idx_events_session_ts seeks to it; a NULL boundary compares ids among the
+    NULL-timestamp rows only.
+    """
+    if timestamp is None:
+        if op == "<=":
+            return "(e.timestamp IS NULL AND e.id <= ?)", [row_id]
+        return f"(e.timestamp IS NOT NULL OR e.id {op} ?)", [row_id]
+    if op == "<=":
+        return "(e.timestamp IS NULL OR (e.timestamp, e.id) <= (?, ?))", [timestamp, row_id]
+    return f"(e.timestamp, e.id) {op} (?, ?)", [timestamp, row_id]
+
+
+# Columns for cmd_traverse's graph mode at detail="normal", aliased to the
+# output keys so each row maps straight onto the returned dict.
+# message_content_json is popped after being decoded into "content".
+_TRAVERSE_NORMAL_COLUMNS = """
+    e.uuid, e.parent_uuid, e.event_type, e.msg_kind, e.timestamp, e.model_id,
+    e.input_tokens, e.output_tokens, e.cache_read_tokens, e.cache_creation_tokens,
+    e.token_rate, e.billable_tokens, e.total_cost_usd,
+    e.message_role AS role, e.message_content AS content, e.message_content_json,
+    e.agent_id, e.agent_slug, sf.filepath, e.line_number
+"""
+
+
+# Columns for cmd_traverse's all-events mode. "full" returns every column as
+# selected; "normal" unpacks the lean list positionally and appends the
+# content columns only when include_content is set.
+_TRAVERSE_ALL_FULL_COLUMNS = """
+    e.uuid, e.parent_uuid, e.event_type, e.msg_kind, e.timestamp, e.timestamp_local,
+    e.message_role, e.message_content, e.message_content_json, e.model_id,
+    e.input_tokens, e.output_tokens, e.cache_read_tokens, e.cache_creation_tokens,
+    e.token_rate, e.billable_tokens, e.total_cost_usd,
+    e.agent_id, e.agent_slug, sf.filepath, e.line_number, e.raw_json
+"""
+_TRAVERSE_ALL_NORMAL_COLUMNS = """
+    e.uuid, e.parent_uuid, e.event_type, e.msg_kind, e.timestamp, e.model_id,
+    e.input_tokens, e.output_tokens, e.cache_read_tokens, e.cache_creation_tokens,
+    e.token_rate, e.billable_tokens, e.total_cost_usd,
+    e.agent_id, e.agent_slug, sf.filepath, e.line_number
+"""
+_TRAVERSE_ALL_CONTENT_COLUMNS = """,
+    e.message_role, e.message_content, e.message_content_json
+"""
+
+
 def cmd_traverse(
     cache: CacheManager,
     session_id: str,
@@ -4350,6 +4961,7 @@ def cmd_traverse(
     summary: bool = False,
     offset: int = 0,
     include_content: bool = True,
+    after_uuid: str | None = None,
 ) -> list[dict[str, Any]]:
     """Retrieve and traverse session events.
 
@@ -4358,8 +4970,8 @@ def cmd_traverse(
       token totals, and accurate costs via ``SUM(billable_tokens)`` / ``SUM(total_cost_usd)``.
       Includes both the main session (``agent_id=NULL``) and all subagents.
     - **all** (``all_events=True``): Flat chronological listing of all events in the session,
-      including subagent events.  Supports ``offset``, ``result_limit``, ``event_types``,
-      ``since``/``until``, ``detail``, and ``include_content``.
+      including subagent events.  Supports ``after_uuid``, ``offset``, ``result_limit``,
+      ``event_types``, ``since``/``until``, ``detail``, and ``include_content``.
     - **graph traversal** (default): Walk the ``event_edges`` ancestor/descendant tree from a
       starting UUID.  When ``uuid`` is omitted, defaults to the most recent event so traversal
       walks backwards through recent history.
@@ -4375,6 +4987,11 @@ def cmd_traverse(
         summary: Return per-agent aggregated stats instead of individual events.
         offset: Skip first N events (used with all_events mode).
         include_content: Include message content and role in all_events normal-detail output.
+        after_uuid: Keyset cursor for all_events mode — return only events ordered after
+            this one (pass the last ``uuid`` of the previous page). A timestamped cursor
+            seeks idx_events_session_ts instead of scanning and discarding ``offset``
+            rows; ``turn_num`` then counts from the cursor. An unknown cursor UUID
+            yields no events.
     """
     ensure_cache(cache)
     cursor = cache.conn.cursor()
@@ -4403,17 +5020,20 @@ def cmd_traverse(
             agg_query += " AND project_id = ?"
             agg_params.append(project_id)
         agg_query += " GROUP BY agent_id ORDER BY first_event"
-        return [dict(row) for row in cursor.execute(agg_query, agg_params).fetchall()]
+        return [dict(row) for row in cursor.execute(agg_query, agg_params)]
 
     # --- ALL-EVENTS MODE: flat chronological listing ---
     if all_events:
-        flat_query = """
-            SELECT
-                e.uuid, e.parent_uuid, e.event_type, e.msg_kind, e.timestamp, e.timestamp_local,
-                e.message_role, e.message_content, e.message_content_json, e.model_id,
-                e.input_tokens, e.output_tokens, e.cache_read_tokens, e.cache_creation_tokens,
-                e.token_rate, e.billable_tokens, e.total_cost_usd,
-                e.agent_id, e.agent_slug, sf.filepath, e.line_number, e.raw_json
+        # Normal detail copies out only the columns it returns, and the
+        # content columns only when include_content asks for them.
+        if detail == "full":
+            flat_cols = _TRAVERSE_ALL_FULL_COLUMNS
+        elif include_content:
+            flat_cols = _TRAVERSE_ALL_NORMAL_COLUMNS + _TRAVERSE_ALL_CONTENT_COLUMNS
+        else:
+            flat_cols = _TRAVERSE_ALL_NORMAL_COLUMNS
+        flat_query = f"""
+            SELECT {flat_cols}
             FROM events e
             JOIN source_files sf ON e.source_file_id = sf.id
             WHERE e.session_id = ?
@@ -4429,58 +5049,103 @@ def cmd_traverse(
         if since:
             since_dt = parse_time_filter(since)
             if since_dt:
-                flat_query += " AND e.timestamp >= ?"
-                flat_params.append(since_dt.isoformat())
+                flat_query += " AND e.timestamp_ms >= ?"
+                flat_params.append(_epoch_ms(since_dt))
         if until:
             until_dt = parse_time_filter(until)
             if until_dt:
-                flat_query += " AND e.timestamp <= ?"
-                flat_params.append(until_dt.isoformat())
-        limit_val = result_limit if result_limit is not None else -1
-        flat_query += f" ORDER BY e.timestamp LIMIT {limit_val} OFFSET {offset}"
-        flat_rows = cursor.execute(flat_query, flat_params).fetchall()
+                flat_query += " AND e.timestamp_ms <= ?"
+                flat_params.append(_epoch_ms(until_dt))
+        if after_uuid:
+            # Resume strictly after the cursor row's (timestamp, id) position;
+            # _timeline_bound keeps NULL-timestamp cursors (summary events)
+            # in the same order the listing uses.
+            cursor_row = cursor.execute(
+                "SELECT timestamp, id FROM events WHERE session_id = ? AND uuid = ?",
+                (session_id, after_uuid),
+            ).fetchone()
+            if cursor_row is None:
+                return []
+            predicate, bound_params = _timeline_bound(">", cursor_row[0], cursor_row[1])
+            flat_query += f" AND {predicate}"
+            flat_params.extend(bound_params)
+        # Bind LIMIT/OFFSET rather than formatting them in, so every page of a
+        # walk reuses one prepared statement from the connection's cache.
+        flat_query += " ORDER BY e.timestamp, e.id LIMIT ? OFFSET ?"
+        flat_params.extend([result_limit if result_limit is not None else -1, offset])
+        if detail != "full":
+            # Normal detail unpacks positionally; plain tuples are cheaper
+            # to build than sqlite3.Row and unpack faster.
+            cursor.row_factory = None
+        flat_rows = cursor.execute(flat_query, flat_params)
 
         turns: list[dict[str, Any]] = []
-        for i, row in enumerate(flat_rows, start=offset + 1):
-            if detail == "full":
+        if detail == "full":
+            for row in flat_rows:
                 ev: dict[str, Any] = dict(row)
                 if ev.get("raw_json"):
                     try:
-                        ev["message_json"] = json.loads(ev["raw_json"])
+                        ev["message_json"] = _json_loads(ev["raw_json"])
                     except json.JSONDecodeError:
                         ev["message_json"] = None
                 turns.append(ev)
-            else:
-                turn: dict[str, Any] = {
-                    "turn_num": i,
-                    "type": row["event_type"],
-                    "msg_kind": row["msg_kind"],
-                    "timestamp": row["timestamp"],
-                    "model_id": row["model_id"],
-                    "input_tokens": row["input_tokens"],
-                    "output_tokens": row["output_tokens"],
-                    "cache_read_tokens": row["cache_read_tokens"],
-                    "cache_creation_tokens": row["cache_creation_tokens"],
-                    "token_rate": row["token_rate"],
-                    "billable_tokens": row["billable_tokens"],
-                    "total_cost_usd": row["total_cost_usd"],
-                    "uuid": row["uuid"],
-                    "parent_uuid": row["parent_uuid"],
-                    "agent_id": row["agent_id"],
-                    "agent_slug": row["agent_slug"],
-                    "filepath": row["filepath"],
-                    "line_number": row["line_number"],
-                }
-                if include_content:
-                    if row["message_content_json"]:
-                        try:
-                            turn["content"] = json.loads(row["message_content_json"])
-                        except json.JSONDecodeError:
-                            turn["content"] = row["message_content"]
-                    else:
-                        turn["content"] = row["message_content"]
-                    turn["role"] = row["message_role"]
-                turns.append(turn)
+            return turns
+
+        # Normal detail reads every selected column, so unpack each Row once
+        # by position (matching _TRAVERSE_ALL_NORMAL_COLUMNS, then the
+        # optional content columns) rather than paying a by-name lookup per
+        # field.
+        for turn_num, (
+            ev_uuid,
+            parent_uuid,
+            event_type,
+            msg_kind,
+            timestamp,
+            model_id,
+            input_tokens,
+            output_tokens,
+            cache_read_tokens,
+            cache_creation_tokens,
+            token_rate,
+            billable_tokens,
+            total_cost_usd,
+            agent_id,
+            agent_slug,
+            filepath,
+            line_number,
+            *content_cols,
+        ) in enumerate(flat_rows, start=offset + 1):
+            turn: dict[str, Any] = {
+                "turn_num": turn_num,
+                "type": event_type,
+                "msg_kind": msg_kind,
+                "timestamp": timestamp,
+                "model_id": model_id,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cache_read_tokens": cache_read_tokens,
+                "cache_creation_tokens": cache_creation_tokens,
+                "token_rate": token_rate,
+                "billable_tokens": billable_tokens,
+                "total_cost_usd": total_cost_usd,
+                "uuid": ev_uuid,
+                "parent_uuid": parent_uuid,
+                "agent_id": agent_id,
+                "agent_slug": agent_slug,
+                "filepath": filepath,
+                "line_number": line_number,
+            }
+            if include_content:
+                message_role, message_content, message_content_json = content_cols
+                if message_content_json:
+                    try:
+                        turn["content"] = _json_loads(message_content_json)
+                    except json.JSONDecodeError:
+                        turn["content"] = message_content
+                else:
+                    turn["content"] = message_content
+                turn["role"] = message_role
+            turns.append(turn)
         return turns
 
     # --- GRAPH TRAVERSAL MODE ---
@@ -4495,58 +5160,48 @@ def cmd_traverse(
         uuid = str(row["uuid"])
         log.info("traverse: defaulting to most recent event %s", uuid)
 
-    result_uuids: set[str] = {uuid}
-    depth_clause = f"AND aw.depth < {depth_limit}" if depth_limit > 0 else ""
-
-    # Walk ancestors via recursive CTE
+    # Walk the edge graph and fetch the matching events in one statement:
+    # the recursive CTEs feed the IN (SELECT ...) directly, so the visited
+    # UUID set never round-trips through Python as a dynamic IN-list.
+    # UNION (not UNION ALL) keeps the walks from re-expanding a node reached
+    # at the same depth by two paths.
+    depth_clause = " AND w.depth < ?" if depth_limit > 0 else ""
+    # walk name -> (column stepped to, column joined on the current node)
+    steps: dict[str, tuple[str, str]] = {}
     if direction in ("ancestors", "both"):
-        ancestor_sql = f"""
-            WITH RECURSIVE ancestor_walk(current_uuid, depth) AS (
-                SELECT ?, 0
-                UNION
-                SELECT ee.parent_event_uuid, aw.depth + 1
-                FROM event_edges ee
-                INNER JOIN ancestor_walk aw ON ee.event_uuid = aw.current_uuid
-                WHERE ee.session_id = ? {depth_clause}
-            )
-            SELECT current_uuid FROM ancestor_walk
-        """
-        ancestor_params: list[Any] = [uuid, session_id]
-        rows = cursor.execute(ancestor_sql, ancestor_params).fetchall()
-        result_uuids.update(row[0] for row in rows)
-
-    depth_clause = f"AND dw.depth < {depth_limit}" if depth_limit > 0 else ""
-
-    # Walk descendants via recursive CTE
+        steps["ancestor_walk"] = ("parent_event_uuid", "event_uuid")
     if direction in ("descendants", "both"):
-        descendant_sql = f"""
-            WITH RECURSIVE descendant_walk(current_uuid, depth) AS (
+        steps["descendant_walk"] = ("event_uuid", "parent_event_uuid")
+    walks: list[str] = []
+    fetch_params: list[Any] = []
+    for name, (next_col, join_col) in steps.items():
+        walks.append(f"""
+            {name}(current_uuid, depth) AS (
                 SELECT ?, 0
                 UNION
-                SELECT ee.event_uuid, dw.depth + 1
+                SELECT ee.{next_col}, w.depth + 1
                 FROM event_edges ee
-                INNER JOIN descendant_walk dw ON ee.parent_event_uuid = dw.current_uuid
-                WHERE ee.session_id = ? {depth_clause}
-            )
-            SELECT current_uuid FROM descendant_walk
-        """
-        descendant_params: list[Any] = [uuid, session_id]
-        rows = cursor.execute(descendant_sql, descendant_params).fetchall()
-        result_uuids.update(row[0] for row in rows)
-
-    if not result_uuids:
-        return []
-
-    # Fetch event rows for all collected UUIDs, applying optional filters
-    placeholders = ",".join("?" * len(result_uuids))
+                INNER JOIN {name} w ON ee.{join_col} = w.current_uuid
+                WHERE ee.session_id = ?{depth_clause}
+            )""")
+        fetch_params.extend([uuid, session_id])
+        if depth_limit > 0:
+            fetch_params.append(depth_limit)
+    visited = " UNION ".join(f"SELECT current_uuid FROM {name}" for name in steps)
+
+    # Only "full" detail needs every column (and raw_json decoded); "normal"
+    # selects just the fields it returns so raw_json and the other unused
+    # columns are never copied out of SQLite.
+    select_cols = "e.*, sf.filepath" if detail == "full" else _TRAVERSE_NORMAL_COLUMNS
     fetch_query = f"""
-        SELECT e.*, sf.filepath
+        WITH RECURSIVE {",".join(walks)}
+        SELECT {select_cols}
         FROM events e
         JOIN source_files sf ON e.source_file_id = sf.id
-        WHERE e.uuid IN ({placeholders})
-          AND e.session_id = ?
+        WHERE e.session_id = ?
+          AND e.uuid IN ({visited})
     """
-    fetch_params: list[Any] = list(result_uuids) + [session_id]
+    fetch_params.append(session_id)
 
     if project_id:
         fetch_query += " AND e.project_id = ?"
@@ -4558,19 +5213,20 @@ def cmd_traverse(
     if since:
         since_dt = parse_time_filter(since)
         if since_dt:
-            fetch_query += " AND e.timestamp >= ?"
-            fetch_params.append(since_dt.isoformat())
+            fetch_query += " AND e.timestamp_ms >= ?"
+            fetch_params.append(_epoch_ms(since_dt))
     if until:
         until_dt = parse_time_filter(until)
         if until_dt:
-            fetch_query += " AND e.timestamp <= ?"
-            fetch_params.append(until_dt.isoformat())
+            fetch_query += " AND e.timestamp_ms <= ?"
+            fetch_params.append(_epoch_ms(until_dt))
 
     fetch_query += " ORDER BY e.timestamp"
     if result_limit is not None:
-        fetch_query += f" LIMIT {result_limit}"
+        fetch_query += " LIMIT ?"
+        fetch_params.append(result_limit)
 
-    event_rows = cursor.execute(fetch_query, fetch_params).fetchall()
+    event_rows = cursor.execute(fetch_query, fetch_params)
 
     results: list[dict[str, Any]] = []
     for row in event_rows:
@@ -4578,39 +5234,18 @@ def cmd_traverse(
             event: dict[str, Any] = dict(row)
             if event.get("raw_json"):
                 try:
-                    event["message_json"] = json.loads(event["raw_json"])
+                    event["message_json"] = _json_loads(event["raw_json"])
                 except json.JSONDecodeError:
                     event["message_json"] = None
         else:
             # "normal": return key fields only — no raw_json, no message_content_json
-            r = row
-            content: Any = r["message_content"]
-            if r["message_content_json"]:
+            event = dict(row)
+            content_json = event.pop("message_content_json")
+            if content_json:
                 try:
-                    content = json.loads(r["message_content_json"])
+                    event["content"] = _json_loads(content_json)
                 except json.JSONDecodeError:
                     pass
-            event = {
-                "uuid": r["uuid"],
-                "parent_uuid": r["parent_uuid"],
-                "event_type": r["event_type"],
-                "msg_kind": r["msg_kind"],
-                "timestamp": r["timestamp"],
-                "model_id": r["model_id"],
-                "input_tokens": r["input_tokens"],
-                "output_tokens": r["output_tokens"],
-                "cache_read_tokens": r["cache_read_tokens"],
-                "cache_creation_tokens": r["cache_creation_tokens"],
-                "token_rate": r["token_rate"],
-                "billable_tokens": r["billable_tokens"],
-                "total_cost_usd": r["total_cost_usd"],
-                "role": r["message_role"],
-                "content": content,
-                "agent_id": r["agent_id"],
-                "agent_slug": r["agent_slug"],
-                "filepath": r["filepath"],
-                "line_number": r["line_number"],
-            }
         results.append(event)
 
     return results
@@ -4646,30 +5281,37 @@ def cmd_trajectory(
         query += f" AND e.msg_kind IN ({placeholders})"
         params.extend(event_types)
 
-    query += " ORDER BY e.timestamp"
-
-    results = cursor.execute(query, params).fetchall()
-    events = [dict(row) for row in results]
-
-    # Apply UUID range
-    if start_uuid:
-        start_idx = next((i for i, e in enumerate(events) if e.get("uuid") == start_uuid), 0)
-        events = events[start_idx:]
+    # Apply UUID range in SQL: resolve each boundary UUID to its
+    # (timestamp, id) position once (idx_events_session_uuid) and bound the
+    # timeline with it, so same-timestamp siblings outside the range stay
+    # out. An unknown boundary UUID leaves that side open.
+    bounds: tuple[tuple[str | None, Literal[">=", "<="]], ...] = ((start_uuid, ">="), (end_uuid, "<="))
+    for boundary_uuid, op in bounds:
+        if not boundary_uuid:
+            continue
+        bound = cursor.execute(
+            "SELECT timestamp, id FROM events WHERE session_id = ? AND uuid = ?",
+            (session_id, boundary_uuid),
+        ).fetchone()
+        if bound is not None:
+            predicate, bound_params = _timeline_bound(op, bound[0], bound[1])
+            query += f" AND {predicate}"
+            params.extend(bound_params)
 
-    if end_uuid:
-        end_idx = next(
-            (i for i, e in enumerate(events) if e.get("uuid") == end_uuid), len(events) - 1
-        )
-        events = events[: end_idx + 1]
+    query += " ORDER BY e.timestamp, e.id"
 
     if limit:
-        events = events[:limit]
+        query += " LIMIT ?"
+        params.append(limit)
+
+    results = cursor.execute(query, params)
+    events = [dict(row) for row in results]
 
     # Parse message JSON and enrich with cost fields
     for event in events:
         if event.get("raw_json"):
             try:
-                event["message_json"] = json.loads(event["raw_json"])
+                event["message_json"] = _json_loads(event["raw_json"])
             except json.JSONDecodeError:
                 event["message_json"] = None
 
@@ -4688,24 +5330,10 @@ def parse_time_filter(time_str: str) -> datetime | None:
 
     time_str = time_str.strip()
 
-    match = re.match(r"^(\d+)([mhdw])$", time_str)
+    match = _REL_TIME_RE.match(time_str)
     if match:
-        value = int(match.group(1))
-        unit = match.group(2)
-
-        now = datetime.now(UTC)
-        if unit == "m":
-            delta = timedelta(minutes=value)
-        elif unit == "h":
-            delta = timedelta(hours=value)
-        elif unit == "d":
-            delta = timedelta(days=value)
-        elif unit == "w":
-            delta = timedelta(weeks=value)
-        else:
-            return None
-
-        return now - delta
+        value, unit = match.groups()
+        return datetime.now(UTC) - timedelta(**{_REL_TIME_UNITS[unit]: int(value)})
 
     try:
         return datetime.fromisoformat(time_str.replace("Z", "+00:00"))
@@ -4713,15 +5341,42 @@ def parse_time_filter(time_str: str) -> datetime | None:
         return None
 
 
+def _epoch_ms(dt: datetime) -> int:
+    """Epoch milliseconds for ``dt``, matching ``events.timestamp_ms``.
+
+    Naive datetimes are taken as UTC, as SQLite's julianday() does.
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return round(dt.timestamp() * 1000)
+
+
+# Non-str keys (e.g. int buckets) are stringified like json.dumps would.
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS if _HAS_ORJSON else 0
+
+
+def _json_dumps_output(data: Any, indent: bool = False) -> str:
+    """Serialise ``data`` for json/jsonl output, via orjson when installed."""
+    if not _HAS_ORJSON:
+        return json.dumps(data, indent=2 if indent else None, default=str)
+    option = (_ORJSON_OPTS | orjson.OPT_INDENT_2) if indent else _ORJSON_OPTS
+    return orjson.dumps(data, default=str, option=option).decode()
+
+
 def format_output(data: Any, output_format: str = "table") -> str:
     """Format output data for display."""
     if output_format == "json":
-        return json.dumps(data, indent=2, default=str)
+        return _json_dumps_output(data, indent=True)
 
     if output_format == "jsonl":
         if isinstance(data, dict):
-            return json.dumps(data, default=str)
-        return "\n".join(json.dumps(row, default=str) for row in data)
+            return _json_dumps_output(data)
+        if not _HAS_ORJSON:
+            return "\n".join(_json_dumps_output(row) for row in data)
+        # Join the encoded bytes and decode once rather than once per row.
+        return b"\n".join(
+            orjson.dumps(row, default=str, option=_ORJSON_OPTS) for row in data
+        ).decode()
 
     # Table format
     if not data:
@@ -4735,23 +5390,39 @@ def format_output(data: Any, output_format: str = "table") -> str:
 
     columns = list(data[0].keys())
 
-    widths = {}
-    for col in columns:
-        widths[col] = max(
-            len(str(col)),
-            max(len(str(row.get(col, ""))[:50]) for row in data),
-        )
+    # Stringify each cell once; widths accumulate in the same pass and the
+    # render below reuses the cached cells.
+    cells = [[str(row.get(col, ""))[:50] for col in columns] for row in data]
+    widths = [len(str(col)) for col in columns]
+    for row_cells in cells:
+        for i, cell in enumerate(row_cells):
+            widths[i] = max(widths[i], len(cell))
+
+    header = " | ".join(str(col).ljust(width)[:50] for col, width in zip(columns, widths))
+    lines = [header, "-" * len(header)]
+    lines.extend(
+        " | ".join(cell.ljust(width) for cell, width in zip(row_cells, widths))
+        for row_cells in cells
+    )
+    return "\n".join(lines)
 
-    lines = []
-    header = " | ".join(str(col).ljust(widths[col])[:50] for col in columns)
-    lines.append(header)
-    lines.append("-" * len(header))
 
-    for row in data:
-        line = " | ".join(str(row.get(col, ""))[:50].ljust(widths[col]) for col in columns)
-        lines.append(line)
+def write_output(data: Any, output_format: str = "table", out: TextIO | None = None) -> None:
+    """Write formatted output to ``out`` (stdout by default).
 
-    return "\n".join(lines)
+    A jsonl list is streamed one row at a time instead of being joined into
+    a single string first, so a large ``traverse --all`` starts flowing into
+    ``jq``/``grep`` immediately and never holds the whole rendering in memory.
+    Other formats go through ``format_output``.
+    """
+    stream = sys.stdout if out is None else out
+    if output_format == "jsonl" and isinstance(data, list):
+        for row in data:
+            stream.write(_json_dumps_output(row))
+            stream.write("\n")
+        return
+    stream.write(format_output(data, output_format))
+    stream.write("\n")
 
 
 # ============================================================================
@@ -4872,19 +5543,21 @@ def main(
                 event_types=getattr(args, "types", None),
                 since=getattr(args, "since", None),
                 until=getattr(args, "until", None),
-                result_limit=args.limit,
+                # 0 lifts the default bound (same convention as --depth).
+                result_limit=args.limit or None,
                 detail=args.detail,
                 all_events=args.all,
                 summary=args.summary,
                 offset=getattr(args, "offset", 0),
                 include_content=not getattr(args, "no_content", False),
+                after_uuid=getattr(args, "after", None),
             )
 
         else:
             log.error(f"Unknown command: {args.command}")
             return
 
-        print(format_output(result, args.format))
+        write_output(result, args.format)
 
     except Exception as e:
         log.exception(f"Error: {e}")
@@ -5041,8 +5714,8 @@ if __name__ == "__main__":  # pragma: no cover
         "-n",
         "--limit",
         type=int,
-        default=None,
-        help="Max events to return (default: all)",
+        default=500,
+        help="Max events to return. 0 = unlimited. Default: 500",
     )
     traverse_parser.add_argument(
         "--detail",
@@ -5056,8 +5729,8 @@ if __name__ == "__main__":  # pragma: no cover
         default=False,
         help=(
             "Return all events in the session chronologically (bypasses graph traversal). "
-            "Includes subagent events. Supports --types, --since, --until, -n, --offset, "
-            "--detail, and --no-content."
+            "Includes subagent events. Supports --types, --since, --until, -n, --after, "
+            "--offset, --detail, and --no-content."
         ),
     )
     traverse_parser.add_argument(
@@ -5075,6 +5748,14 @@ if __name__ == "__main__":  # pragma: no cover
         default=0,
         help="Skip first N events (used with --all, default: 0)",
     )
+    traverse_parser.add_argument(
+        "--after",
+        metavar="UUID",
+        help=(
+            "Page --all output after this event UUID (the last uuid of the previous page). "
+            "Seeks directly, unlike --offset which rescans skipped events."
+        ),
+    )
     traverse_parser.add_argument(
         "--no-content",
         action="store_true",
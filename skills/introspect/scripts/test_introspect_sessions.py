@@ -19,6 +19,8 @@ Coverage: uv run --with pytest-cov pytest test_introspect_sessions.py --cov=intr
 from __future__ import annotations
 
 import json
+import os
+import sqlite3
 import subprocess
 import sys
 import tempfile
@@ -67,6 +69,16 @@ def make_event(
     return json.dumps(event)
 
 
+def query_plan(conn: sqlite3.Connection, sql: str) -> str:
+    """Return the EXPLAIN QUERY PLAN detail lines for ``sql``, joined into one string.
+
+    Every ``?`` is bound to NULL: the plan depends on the placeholders, not
+    their values.
+    """
+    params = (None,) * sql.count("?")
+    return " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
 # ============================================================================
 # Fixtures
 # ============================================================================
@@ -332,6 +344,20 @@ class TestCacheManager:
         temp_cache.clear()
         temp_cache.clear()
 
+    def test_clear_restores_triggers_and_fts(self, populated_cache: iss.CacheManager) -> None:
+        """Test that clear() wipes events without losing the FTS/count triggers."""
+        conn = populated_cache.conn
+        trigger_sql = "SELECT name FROM sqlite_master WHERE type='trigger' AND tbl_name IN ('events', 'event_edges')"
+        triggers_before = {row[0] for row in conn.execute(trigger_sql)}
+        assert triggers_before
+
+        populated_cache.clear()
+
+        assert {row[0] for row in conn.execute(trigger_sql)} == triggers_before
+        conn.execute("INSERT INTO events_fts(events_fts) VALUES ('integrity-check')")
+        assert conn.execute("SELECT COUNT(*) FROM events_fts WHERE events_fts MATCH 'Hello'").fetchone()[0] == 0
+        assert populated_cache.get_status()["events"] == 0
+
     def test_clear_without_tables(self, temp_dir: Path) -> None:
         """Test clear() works even when tables don't exist yet."""
         db_path = temp_dir / "empty_cache.db"
@@ -376,6 +402,20 @@ class TestCacheManager:
         cache.reset()  # Should not raise
         assert db_path.exists()
 
+    def test_connection_pragmas_applied(self, temp_cache: iss.CacheManager) -> None:
+        """Test that the read-tuned pragmas are set when the connection opens."""
+        conn = temp_cache.conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+        assert conn.execute("PRAGMA analysis_limit").fetchone()[0] == 400
+
+    def test_update_truncates_wal(self, populated_cache: iss.CacheManager) -> None:
+        """update() checkpoints the WAL back to zero bytes once ingest is done."""
+        wal = populated_cache.db_path.with_name(populated_cache.db_path.name + "-wal")
+        assert not wal.exists() or wal.stat().st_size == 0
+
     def test_get_status_returns_correct_info(self, temp_cache: iss.CacheManager) -> None:
         """Test that get_status returns expected fields."""
         status = temp_cache.get_status()
@@ -389,6 +429,27 @@ class TestCacheManager:
         assert "created_at" in status
         assert "last_update_at" in status
 
+    def test_get_status_counts_track_inserts_and_deletes(
+        self, populated_cache: iss.CacheManager
+    ) -> None:
+        """Trigger-maintained table_counts stay equal to COUNT(*)."""
+        conn = populated_cache.conn
+
+        def actual(table: str) -> int:
+            return int(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+
+        status = populated_cache.get_status()
+        assert status["events"] == actual("events") > 0
+        assert status["event_edges"] == actual("event_edges") > 0
+
+        conn.execute("DELETE FROM events WHERE uuid = 'uuid-006'")
+        conn.execute("DELETE FROM event_edges WHERE event_uuid = 'uuid-002'")
+        conn.commit()
+
+        status = populated_cache.get_status()
+        assert status["events"] == actual("events")
+        assert status["event_edges"] == actual("event_edges")
+
     def test_discover_files_finds_jsonl(self, temp_dir: Path, sample_jsonl_file: Path) -> None:
         """Test that discover_files finds JSONL files."""
         db_path = temp_dir / "test_cache.db"
@@ -453,6 +514,234 @@ class TestCacheManager:
         assert result["files_updated"] == 0
         assert result["events_added"] == 0
 
+    def test_update_parallel_parse_matches_serial(
+        self,
+        temp_dir: Path,
+        rich_sample_events: list[dict[str, Any]],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Parsing in the worker pool ingests exactly what the serial path does."""
+        projects_dir = temp_dir / "projects"
+        project_dir = projects_dir / "-Test-Project"
+        project_dir.mkdir(parents=True)
+        for n in range(3):
+            with open(project_dir / f"session-{n}.jsonl", "w") as f:
+                f.writelines(json.dumps({**event, "sessionId": f"session-{n}"}) + "\n" for event in rich_sample_events)
+
+        snapshots = []
+        for min_files in (iss.PARALLEL_PARSE_MIN_FILES, 1):
+            monkeypatch.setattr(iss, "PARALLEL_PARSE_MIN_FILES", min_files)
+            monkeypatch.setattr(iss.os, "cpu_count", lambda: 2)
+            cache = iss.CacheManager(db_path=temp_dir / f"cache-{min_files}.db")
+            cache.init_schema()
+            result = cache.update(projects_dir)
+            rows = cache.conn.execute(
+                "SELECT session_id, uuid, msg_kind, billable_tokens, is_response_head "
+                "FROM events ORDER BY session_id, uuid"
+            ).fetchall()
+            snapshots.append((result["events_added"], [tuple(r) for r in rows]))
+            cache.close()
+
+        assert snapshots[0] == snapshots[1]
+        assert snapshots[0][0] == 3 * len(rich_sample_events)
+
+    @pytest.mark.parametrize(("platform", "fork"), [("linux", True), ("darwin", False)])
+    def test_parse_pool_start_method_and_early_close(
+        self,
+        temp_dir: Path,
+        rich_sample_events: list[dict[str, Any]],
+        monkeypatch: pytest.MonkeyPatch,
+        platform: str,
+        fork: bool,
+    ) -> None:
+        """fork is Linux-only, and closing the results early cancels queued parses."""
+        import multiprocessing
+
+        project_dir = temp_dir / "projects" / "-Test-Project"
+        project_dir.mkdir(parents=True)
+        for n in range(4):
+            with open(project_dir / f"session-{n}.jsonl", "w") as f:
+                f.writelines(json.dumps(event) + "\n" for event in rich_sample_events)
+
+        pools: list[dict[str, Any]] = []
+
+        class RecordingPool(iss.ProcessPoolExecutor):
+            def __init__(self, *args: Any, **kwargs: Any) -> None:
+                pools.append({"start_method": kwargs["mp_context"].get_start_method()})
+                super().__init__(*args, **kwargs)
+
+            def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+                pools[-1]["cancel_futures"] = cancel_futures
+                super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+        monkeypatch.setattr(iss, "ProcessPoolExecutor", RecordingPool)
+        monkeypatch.setattr(iss, "PARALLEL_PARSE_MIN_FILES", 1)
+        monkeypatch.setattr(iss.os, "cpu_count", lambda: 2)
+        monkeypatch.setattr(iss.sys, "platform", platform)
+
+        cache = iss.CacheManager(db_path=temp_dir / "pool.db")
+        files = cache.discover_files(temp_dir / "projects")
+        parsed = cache._parse_files(files)
+        assert next(parsed) is not None
+        parsed.close()
+
+        expected = "fork" if fork else multiprocessing.get_context().get_start_method()
+        assert pools == [{"start_method": expected, "cancel_futures": True}]
+        cache.close()
+
+    def test_parse_pool_keeps_a_bounded_window_in_order(
+        self,
+        temp_dir: Path,
+        rich_sample_events: list[dict[str, Any]],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """At most workers x PARALLEL_PARSE_WINDOW_PER_WORKER parses are queued, submitted in input order."""
+        project_dir = temp_dir / "projects" / "-Test-Project"
+        project_dir.mkdir(parents=True)
+        for n in range(10):
+            with open(project_dir / f"session-{n}.jsonl", "w") as f:
+                f.writelines(json.dumps({**event, "sessionId": f"session-{n}"}) + "\n" for event in rich_sample_events)
+
+        submitted: list[str] = []
+
+        class RecordingPool(iss.ProcessPoolExecutor):
+            def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Any:
+                submitted.append(args[0]["filepath"])
+                return super().submit(fn, *args, **kwargs)
+
+        monkeypatch.setattr(iss, "ProcessPoolExecutor", RecordingPool)
+        monkeypatch.setattr(iss, "PARALLEL_PARSE_MIN_FILES", 1)
+        monkeypatch.setattr(iss.os, "cpu_count", lambda: 2)
+
+        cache = iss.CacheManager(db_path=temp_dir / "window.db")
+        files = cache.discover_files(temp_dir / "projects")
+        parsed = cache._parse_files(files)
+        first = next(parsed)
+        assert len(submitted) == 2 * iss.PARALLEL_PARSE_WINDOW_PER_WORKER + 1
+        results = [first, *parsed]
+
+        assert submitted == [f["filepath"] for f in files]
+        assert [r[2] if r else None for r in results] == [
+            r[2] if r else None for r in map(cache.parse_source_file, files)
+        ]
+        cache.close()
+
+    def test_update_commits_in_file_batches(
+        self,
+        temp_dir: Path,
+        rich_sample_events: list[dict[str, Any]],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Intermediate per-batch commits don't drop or duplicate any file."""
+        project_dir = temp_dir / "projects" / "-Test-Project"
+        project_dir.mkdir(parents=True)
+        for n in range(5):
+            with open(project_dir / f"session-{n}.jsonl", "w") as f:
+                f.writelines(json.dumps({**event, "sessionId": f"session-{n}"}) + "\n" for event in rich_sample_events)
+
+        monkeypatch.setattr(iss, "INGEST_COMMIT_EVERY", 2)
+        cache = iss.CacheManager(db_path=temp_dir / "batched.db")
+        cache.init_schema()
+        result = cache.update(temp_dir / "projects")
+
+        assert result["files_updated"] == 5
+        assert cache.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 5 * len(
+            rich_sample_events
+        )
+        assert cache.conn.execute("SELECT COUNT(*) FROM source_files").fetchone()[0] == 5
+
+    def test_interrupted_update_finishes_committed_sessions(
+        self,
+        temp_dir: Path,
+        rich_sample_events: list[dict[str, Any]],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Sessions from batches committed before an interruption get their post-ingest pass next run."""
+        projects_dir = temp_dir / "projects"
+        project_dir = projects_dir / "-Test-Project"
+        project_dir.mkdir(parents=True)
+        for n in range(5):
+            with open(project_dir / f"session-{n}.jsonl", "w") as f:
+                f.writelines(json.dumps({**event, "sessionId": f"session-{n}"}) + "\n" for event in rich_sample_events)
+
+        monkeypatch.setattr(iss, "INGEST_COMMIT_EVERY", 2)
+        real_ingest = iss.CacheManager.ingest_file
+        calls = 0
+
+        def failing_ingest(self: iss.CacheManager, *args: Any, **kwargs: Any) -> int:
+            nonlocal calls
+            calls += 1
+            if calls == 3:
+                raise KeyboardInterrupt
+            return real_ingest(self, *args, **kwargs)
+
+        cache = iss.CacheManager(db_path=temp_dir / "interrupted.db")
+        cache.init_schema()
+        monkeypatch.setattr(iss.CacheManager, "ingest_file", failing_ingest)
+        with pytest.raises(KeyboardInterrupt):
+            cache.update(projects_dir)
+        cache.conn.rollback()
+
+        # The first batch holds exactly INGEST_COMMIT_EVERY files, and its
+        # sessions are recorded as still needing the post-ingest pass.
+        committed = {r[0] for r in cache.conn.execute("SELECT DISTINCT session_id FROM events")}
+        assert len(committed) == 2
+        pending = cache.conn.execute(
+            "SELECT value FROM cache_metadata WHERE key = ?", (iss.PENDING_SESSIONS_KEY,)
+        ).fetchone()
+        assert set(json.loads(pending[0])) == committed
+
+        monkeypatch.setattr(iss.CacheManager, "ingest_file", real_ingest)
+        bridged: list[str] = []
+        real_bridges = iss.CacheManager.build_cross_agent_edges
+
+        def recording_bridges(self: iss.CacheManager, session_id: str, project_id: str) -> int:
+            bridged.append(session_id)
+            return real_bridges(self, session_id, project_id)
+
+        monkeypatch.setattr(iss.CacheManager, "build_cross_agent_edges", recording_bridges)
+        result = cache.update(projects_dir)
+
+        assert result["files_updated"] == 3
+        assert sorted(bridged) == [f"session-{n}" for n in range(5)]
+        assert (
+            cache.conn.execute(
+                "SELECT 1 FROM cache_metadata WHERE key = ?", (iss.PENDING_SESSIONS_KEY,)
+            ).fetchone()
+            is None
+        )
+        cache.close()
+
+    def test_ingest_multirow_insert_chunking(
+        self,
+        temp_dir: Path,
+        sample_jsonl_file: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Splitting inserts into small multi-row statements ingests identical rows."""
+        snapshots = []
+        for batch_rows in (iss.INSERT_BATCH_ROWS, 2):
+            monkeypatch.setattr(iss, "INSERT_BATCH_ROWS", batch_rows)
+            cache = iss.CacheManager(db_path=temp_dir / f"rows-{batch_rows}.db")
+            cache.init_schema()
+            cache.update(temp_dir / "projects")
+            snapshots.append(
+                [
+                    cache.conn.execute(sql).fetchall()
+                    for sql in (
+                        "SELECT id, uuid, line_number FROM events ORDER BY id",
+                        "SELECT event_uuid, parent_event_uuid FROM event_edges ORDER BY id",
+                        "SELECT event_id, ord, call_type, call_name FROM event_calls ORDER BY id",
+                    )
+                ]
+            )
+            cache.close()
+
+        assert [[tuple(r) for r in rows] for rows in snapshots[0]] == [
+            [tuple(r) for r in rows] for rows in snapshots[1]
+        ]
+        assert len(snapshots[0][0]) == 6
+
 
 # ============================================================================
 # SessionEvent Tests
@@ -527,6 +816,8 @@ class TestSessionEvent:
         assert result["input_tokens"] == 100
         assert result["output_tokens"] == 50
         assert result["message_json"] == {"type": "assistant"}
+        # Slotted: no per-instance __dict__.
+        assert not hasattr(event, "__dict__")
 
 
 # ============================================================================
@@ -633,6 +924,11 @@ class TestCacheCommands:
 
         assert result["status"] == "rebuilt"
         assert result["files_updated"] == 1
+        # Planner statistics are collected as part of the rebuild.
+        stat_tables = {
+            row[0] for row in cache.conn.execute("SELECT tbl FROM sqlite_stat1").fetchall()
+        }
+        assert "events" in stat_tables
 
     def test_cmd_cache_update(self, temp_dir: Path, sample_jsonl_file: Path) -> None:
         """Test cache update command."""
@@ -679,11 +975,34 @@ class TestQueryCommands:
         assert result[0]["session_id"] == "session-abc"
         assert result[0]["event_count"] == 6
 
+    def test_cmd_sessions_cost_matches_event_sum(self, populated_cache: iss.CacheManager) -> None:
+        """sessions.total_cost_usd is the sum of the per-event ingest costs."""
+        expected = populated_cache.conn.execute(
+            "SELECT SUM(total_cost_usd) FROM events WHERE session_id = 'session-abc'"
+        ).fetchone()[0]
+        result = iss.cmd_sessions(populated_cache, project_id="-Test-Project")
+
+        assert expected > 0
+        assert result[0]["total_cost_usd"] == pytest.approx(expected)
+
     def test_cmd_sessions_with_since_filter(self, populated_cache: iss.CacheManager) -> None:
         """Test sessions command with time filter."""
         result = iss.cmd_sessions(populated_cache, project_id="-Test-Project", since="30d")
         assert len(result) >= 0  # May be empty if test events are old
 
+    def test_cmd_sessions_since_compares_instants(self, populated_cache: iss.CacheManager) -> None:
+        """--since compares epoch instants, so a +10:00 last_timestamp isn't misread as later."""
+        populated_cache.conn.execute(
+            "UPDATE sessions SET last_timestamp = '2026-01-15T20:00:25+10:00' WHERE session_id = 'session-abc'"
+        )
+        populated_cache.conn.commit()
+
+        before = iss.cmd_sessions(populated_cache, project_id="-Test-Project", since="2026-01-15T10:00:20Z")
+        after = iss.cmd_sessions(populated_cache, project_id="-Test-Project", since="2026-01-15T12:00:00Z")
+
+        assert [s["session_id"] for s in before] == ["session-abc"]
+        assert after == []
+
 
 class TestTraverseAllMode:
     """Tests for cmd_traverse with all_events=True (replaces turns)."""
@@ -737,6 +1056,69 @@ class TestTraverseAllMode:
         assert len(result) == 2
         assert result[0]["turn_num"] == 2
 
+    def test_traverse_all_keyset_pagination(self, populated_cache: iss.CacheManager) -> None:
+        """after_uuid resumes the listing exactly where the previous page ended."""
+        full = iss.cmd_traverse(populated_cache, session_id="session-abc", all_events=True)
+        first = iss.cmd_traverse(
+            populated_cache, session_id="session-abc", all_events=True, result_limit=2
+        )
+        second = iss.cmd_traverse(
+            populated_cache,
+            session_id="session-abc",
+            all_events=True,
+            result_limit=2,
+            after_uuid=first[-1]["uuid"],
+        )
+
+        assert [t["uuid"] for t in first + second] == [t["uuid"] for t in full[:4]]
+        assert second[0]["turn_num"] == 1
+
+    def test_traverse_all_keyset_pages_past_null_timestamps(self, populated_cache: iss.CacheManager) -> None:
+        """Paging one event at a time crosses timestamp-less and tied events without gaps."""
+        conn = populated_cache.conn
+        conn.execute("UPDATE events SET timestamp = NULL WHERE uuid IN ('uuid-001', 'uuid-002')")
+        conn.execute(
+            "UPDATE events SET timestamp = '2026-01-15T10:00:10.000Z' WHERE uuid IN ('uuid-003', 'uuid-004')"
+        )
+        conn.commit()
+        full = iss.cmd_traverse(populated_cache, session_id="session-abc", all_events=True)
+
+        walked: list[str] = []
+        after: str | None = None
+        while True:
+            page = iss.cmd_traverse(
+                populated_cache, session_id="session-abc", all_events=True, result_limit=1, after_uuid=after
+            )
+            if not page:
+                break
+            walked.append(page[0]["uuid"])
+            after = page[0]["uuid"]
+
+        assert walked == [t["uuid"] for t in full]
+        assert len(walked) == 6
+
+    def test_traverse_all_time_bounds_are_format_independent(
+        self, populated_cache: iss.CacheManager
+    ) -> None:
+        """--since/--until compare instants, not ISO strings, and are inclusive."""
+        # fixture events sit at 10:00:00, :05, :10, :15, :20, :25 UTC
+        result = iss.cmd_traverse(
+            populated_cache,
+            session_id="session-abc",
+            all_events=True,
+            since="2026-01-15T20:00:10+10:00",
+            until="2026-01-15T10:00:20Z",
+        )
+
+        assert [t["uuid"] for t in result] == ["uuid-003", "uuid-004", "uuid-005"]
+
+    def test_traverse_all_keyset_unknown_cursor(self, populated_cache: iss.CacheManager) -> None:
+        """An after_uuid that is not in the session returns no events."""
+        result = iss.cmd_traverse(
+            populated_cache, session_id="session-abc", all_events=True, after_uuid="nope"
+        )
+        assert result == []
+
     def test_traverse_all_no_content(self, populated_cache: iss.CacheManager) -> None:
         """include_content=False omits content and role fields."""
         result = iss.cmd_traverse(
@@ -813,6 +1195,16 @@ class TestComputeEventCosts:
         assert token_rate == 15.0
         assert cost == pytest.approx(15.0)
 
+    def test_precomputed_coefficients_match_pricing(self) -> None:
+        """_PRICING_COEFFS stays in lockstep with PRICING for every family."""
+        assert set(iss._PRICING_COEFFS) == set(iss.PRICING)
+        for family, p in iss.PRICING.items():
+            rate, out_mult, read_mult, write_mult = iss._PRICING_COEFFS[family]
+            assert rate == p["input"]
+            assert out_mult == p["output"] / p["input"]
+            assert read_mult == p["cache_read_multiplier"]
+            assert write_mult == p["cache_write_multiplier"]
+
     def test_unknown_model_yields_zero_cost(self) -> None:
         """Unknown model returns token_rate=0 and total_cost_usd=0."""
         token_rate, billable, cost = iss._compute_event_costs(None, 1000, 500, 0, 0)
@@ -891,6 +1283,52 @@ class TestSearchCommand:
             result = iss.cmd_search(populated_cache, pattern=pattern)
             assert isinstance(result, list)
 
+    def test_fts_follows_content_updates_only(self, populated_cache: iss.CacheManager) -> None:
+        """Editing message_content reindexes; editing other columns leaves FTS as-is."""
+        conn = populated_cache.conn
+        conn.execute("UPDATE events SET total_cost_usd = 1.0 WHERE uuid = 'uuid-001'")
+        conn.execute(
+            "UPDATE events SET message_content = 'zanzibarquux' WHERE uuid = 'uuid-001'"
+        )
+        conn.execute("INSERT INTO events_fts(events_fts) VALUES('integrity-check')")
+
+        result = iss.cmd_search(populated_cache, pattern="zanzibarquux")
+        assert [r["uuid"] for r in result] == ["uuid-001"]
+
+    def test_update_indexes_new_events_in_bulk(
+        self, populated_cache: iss.CacheManager, temp_dir: Path
+    ) -> None:
+        """Ingest has no per-row FTS trigger; update() indexes new rows before committing."""
+        conn = populated_cache.conn
+        assert (
+            conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='events_ai'"
+            ).fetchone()
+            is None
+        )
+        session = temp_dir / "projects" / "-Test-Project" / "session-xyz.jsonl"
+        session.write_text(
+            json.dumps(
+                {
+                    "type": "user",
+                    "uuid": "uuid-xyz",
+                    "sessionId": "session-xyz",
+                    "timestamp": "2026-01-15T11:00:00Z",
+                    "message": {"role": "user", "content": "quokkaplatypus"},
+                }
+            )
+            + "\n"
+        )
+        populated_cache.update(temp_dir / "projects")
+
+        conn.execute("INSERT INTO events_fts(events_fts) VALUES('integrity-check')")
+        result = iss.cmd_search(populated_cache, pattern="quokkaplatypus")
+        assert [r["uuid"] for r in result] == ["uuid-xyz"]
+        watermark = conn.execute(
+            "SELECT value FROM cache_metadata WHERE key = ?", (iss.EVENTS_FTS_WATERMARK_KEY,)
+        ).fetchone()[0]
+        assert int(watermark) == conn.execute("SELECT MAX(id) FROM events").fetchone()[0]
+
 
 class TestEscapeFts5Query:
     """Tests for _escape_fts5_query helper."""
@@ -932,6 +1370,35 @@ class TestEscapeFts5Query:
         assert iss._escape_fts5_query("(group)") == '"(group)"'
 
 
+class TestLocalIsoformat:
+    """Tests for the per-minute cached local-time conversion."""
+
+    def test_matches_astimezone_across_dst_boundary(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Cached offsets agree with astimezone() on both sides of a DST change."""
+        monkeypatch.setenv("TZ", "Australia/Sydney")
+        time.tzset()
+        iss._local_tz_at_minute.cache_clear()
+        try:
+            # Sydney DST ends 2026-04-05 03:00 AEDT == 2026-04-04T16:00:00Z.
+            for ts in (
+                "2026-04-04T15:59:00Z",
+                "2026-04-04T15:59:59.999Z",
+                "2026-04-04T16:00:00Z",
+                "2026-04-04T16:00:00.500Z",
+                "2026-04-04T12:00:00+10:00",
+                "2026-01-15T10:00:00",
+            ):
+                expected = datetime.fromisoformat(ts).astimezone()
+                assert iss._local_isoformat(ts) == expected.isoformat()
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+            iss._local_tz_at_minute.cache_clear()
+
+    def test_unparsable_returns_none(self) -> None:
+        assert iss._local_isoformat("not a timestamp") is None
+
+
 class TestModelFamilyFromId:
     """Tests for the model_family_from_id helper function."""
 
@@ -1329,6 +1796,65 @@ class TestEventCommand:
         assert result.get("uuid") == "uuid-001"
 
 
+class TestTrajectoryCommand:
+    """Tests for the cmd_trajectory function."""
+
+    def test_trajectory_full_session(self, populated_cache: iss.CacheManager) -> None:
+        """Without bounds the whole session is returned in timestamp order."""
+        result = iss.cmd_trajectory(populated_cache, session_id="session-abc")
+        assert [r["uuid"] for r in result] == [f"uuid-00{i}" for i in range(1, 7)]
+
+    def test_trajectory_uuid_range(self, populated_cache: iss.CacheManager) -> None:
+        """start_uuid/end_uuid bound the trajectory inclusively."""
+        result = iss.cmd_trajectory(
+            populated_cache,
+            session_id="session-abc",
+            start_uuid="uuid-002",
+            end_uuid="uuid-004",
+        )
+        assert [r["uuid"] for r in result] == ["uuid-002", "uuid-003", "uuid-004"]
+
+    def test_trajectory_range_with_limit(self, populated_cache: iss.CacheManager) -> None:
+        """limit is applied after the start boundary."""
+        result = iss.cmd_trajectory(
+            populated_cache, session_id="session-abc", start_uuid="uuid-003", limit=2
+        )
+        assert [r["uuid"] for r in result] == ["uuid-003", "uuid-004"]
+
+    def test_trajectory_unknown_boundary_is_open(self, populated_cache: iss.CacheManager) -> None:
+        """An unknown boundary UUID leaves that side of the range open."""
+        result = iss.cmd_trajectory(
+            populated_cache,
+            session_id="session-abc",
+            start_uuid="uuid-nonexistent",
+            end_uuid="uuid-002",
+        )
+        assert [r["uuid"] for r in result] == ["uuid-001", "uuid-002"]
+
+    def test_trajectory_range_bounds_on_row_not_timestamp(self, populated_cache: iss.CacheManager) -> None:
+        """Same-timestamp siblings stay outside the range; NULL timestamps sort first."""
+        conn = populated_cache.conn
+        conn.execute(
+            "UPDATE events SET timestamp = '2026-01-15T10:00:05.000Z' "
+            "WHERE uuid IN ('uuid-002', 'uuid-003', 'uuid-004')"
+        )
+        conn.execute("UPDATE events SET timestamp = NULL WHERE uuid = 'uuid-001'")
+        conn.commit()
+
+        result = iss.cmd_trajectory(
+            populated_cache, session_id="session-abc", start_uuid="uuid-003", end_uuid="uuid-003"
+        )
+        assert [r["uuid"] for r in result] == ["uuid-003"]
+
+        result = iss.cmd_trajectory(
+            populated_cache, session_id="session-abc", start_uuid="uuid-001", end_uuid="uuid-002"
+        )
+        assert [r["uuid"] for r in result] == ["uuid-001", "uuid-002"]
+
+        result = iss.cmd_trajectory(populated_cache, session_id="session-abc", end_uuid="uuid-001")
+        assert [r["uuid"] for r in result] == ["uuid-001"]
+
+
 class TestTraverseCommand:
     """Tests for the cmd_traverse function."""
 
@@ -1370,6 +1896,26 @@ class TestTraverseCommand:
         assert "uuid-001" in uuids
         assert "uuid-002" in uuids  # Child
 
+    def test_cmd_traverse_depth_limit(self, populated_cache: iss.CacheManager) -> None:
+        """depth_limit bounds the walk; 0 walks the whole chain."""
+        one_hop = iss.cmd_traverse(
+            populated_cache,
+            session_id="session-abc",
+            uuid="uuid-003",
+            direction="ancestors",
+            depth_limit=1,
+        )
+        assert [r["uuid"] for r in one_hop] == ["uuid-002", "uuid-003"]
+
+        unlimited = iss.cmd_traverse(
+            populated_cache,
+            session_id="session-abc",
+            uuid="uuid-003",
+            direction="ancestors",
+            depth_limit=0,
+        )
+        assert [r["uuid"] for r in unlimited] == ["uuid-001", "uuid-002", "uuid-003"]
+
     def test_cmd_traverse_with_project(self, populated_cache: iss.CacheManager) -> None:
         """Test traverse with project filter."""
         result = iss.cmd_traverse(
@@ -1390,6 +1936,18 @@ class TestTraverseCommand:
         uuids = {r["uuid"] for r in result}
         assert "uuid-003" in uuids
 
+    def test_cmd_traverse_normal_detail_omits_raw_columns(
+        self, populated_cache: iss.CacheManager
+    ) -> None:
+        """Normal detail returns only the key fields, never raw_json or content JSON."""
+        result = iss.cmd_traverse(populated_cache, session_id="session-abc", uuid="uuid-002")
+        assert len(result) > 0
+        for event in result:
+            assert "raw_json" not in event
+            assert "message_content_json" not in event
+            assert "message_json" not in event
+            assert {"role", "content", "filepath", "line_number"} <= set(event)
+
     def test_cmd_traverse_no_uuid_empty_session_returns_empty(
         self, temp_cache: iss.CacheManager
     ) -> None:
@@ -1615,6 +2173,45 @@ class TestFormatOutput:
         parsed = json.loads(output)
         assert parsed == {"key": "value"}
 
+    def test_format_json_roundtrips_non_ascii_and_non_str_keys(self) -> None:
+        """JSON output keeps unicode as-is and stringifies non-str keys."""
+        data = {"text": "café ✓", 3: [1, 2]}
+        assert json.loads(iss.format_output(data, "json")) == {"text": "café ✓", "3": [1, 2]}
+
+    def test_json_loads_falls_back_to_stdlib(self) -> None:
+        """Inputs orjson rejects but the stdlib accepts still decode."""
+        assert iss._json_loads('{"a": 1}') == {"a": 1}
+        assert iss._json_loads('{"s": "\\ud800"}') == {"s": "\ud800"}
+        with pytest.raises(json.JSONDecodeError):
+            iss._json_loads("{not json")
+
+    def test_json_paths_work_without_orjson(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Without orjson, decoding and json/jsonl output use the stdlib."""
+        import io
+
+        monkeypatch.setattr(iss, "_HAS_ORJSON", False)
+        assert iss._json_loads(b'{"a": [1, "\\u00e9"]}') == {"a": [1, "é"]}
+        data = {"text": "café", 3: [1, 2]}
+        assert iss.format_output(data, "json") == json.dumps(data, indent=2, default=str)
+        rows = [{"a": 1}, {"b": "é"}]
+        assert iss.format_output(rows, "jsonl") == "\n".join(json.dumps(r) for r in rows)
+        buf = io.StringIO()
+        iss.write_output(rows, "jsonl", out=buf)
+        assert buf.getvalue() == iss.format_output(rows, "jsonl") + "\n"
+
+    def test_write_output_streams_jsonl_rows(self) -> None:
+        """write_output emits one line per row for jsonl, matching format_output."""
+        import io
+
+        rows = [{"a": 1}, {"b": "é"}]
+        buf = io.StringIO()
+        iss.write_output(rows, "jsonl", out=buf)
+        assert buf.getvalue() == iss.format_output(rows, "jsonl") + "\n"
+
+        buf = io.StringIO()
+        iss.write_output({"k": "v"}, "json", out=buf)
+        assert json.loads(buf.getvalue()) == {"k": "v"}
+
     def test_format_table_single_dict(self) -> None:
         """Test table formatting with a single dict."""
         data = {"name": "Test", "value": 123}
@@ -1647,6 +2244,31 @@ class TestEnsureCache:
 
         assert db_path.exists()
 
+    def test_ensure_cache_checks_once_per_connection(
+        self, temp_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Repeat calls skip the version check until the connection is closed."""
+        cache = iss.CacheManager(db_path=temp_dir / "once.db")
+        projects_dir = temp_dir / "projects"
+        projects_dir.mkdir()
+        iss.ensure_cache(cache, projects_path=projects_dir)
+
+        calls: list[bool] = []
+        original = cache.needs_rebuild
+
+        def counting_needs_rebuild() -> bool:
+            calls.append(True)
+            return original()
+
+        monkeypatch.setattr(cache, "needs_rebuild", counting_needs_rebuild)
+        iss.ensure_cache(cache, projects_path=projects_dir)
+        iss.ensure_cache(cache, projects_path=projects_dir)
+        assert calls == []
+
+        cache.close()
+        iss.ensure_cache(cache, projects_path=projects_dir)
+        assert calls == [True]
+
 
 # ============================================================================
 # Additional Tests for Coverage - Edge Cases
@@ -1881,6 +2503,63 @@ class TestGetFilesNeedingUpdateEdgeCases:
         result = temp_cache.get_files_needing_update(files)
         assert result == []  # File skipped due to OSError
 
+    def _ingest_one(self, cache: iss.CacheManager, temp_dir: Path) -> dict[str, Any]:
+        """Write and ingest a one-event session file; return its discovered file_info."""
+        projects_dir = temp_dir / "projects"
+        project_dir = projects_dir / "-Test-Project"
+        project_dir.mkdir(parents=True)
+        event = {"type": "user", "uuid": "u1", "timestamp": "2026-01-15T10:00:00Z"}
+        (project_dir / "session-001.jsonl").write_text(json.dumps(event) + "\n")
+        cache.update(projects_path=projects_dir)
+        return cache.discover_files(projects_dir)[0]
+
+    def test_mtime_only_change_refreshes_without_reingest(
+        self, temp_cache: iss.CacheManager, temp_dir: Path
+    ) -> None:
+        """A touched-but-unchanged file is not re-queued; its stored mtime is refreshed."""
+        file_info = self._ingest_one(temp_cache, temp_dir)
+        new_mtime = os.stat(file_info["filepath"]).st_mtime + 100
+        os.utime(file_info["filepath"], (new_mtime, new_mtime))
+
+        assert temp_cache.get_files_needing_update([file_info]) == []
+        row = temp_cache.conn.execute(
+            "SELECT mtime FROM source_files WHERE filepath = ?", (file_info["filepath"],)
+        ).fetchone()
+        assert row[0] == new_mtime
+
+    def test_same_size_content_change_is_reingested(
+        self, temp_cache: iss.CacheManager, temp_dir: Path
+    ) -> None:
+        """Same size + new mtime with different bytes is still treated as modified."""
+        file_info = self._ingest_one(temp_cache, temp_dir)
+        path = Path(file_info["filepath"])
+        path.write_text(path.read_text().replace('"u1"', '"u2"'))
+        new_mtime = os.stat(path).st_mtime + 100
+        os.utime(path, (new_mtime, new_mtime))
+
+        result = temp_cache.get_files_needing_update([file_info])
+        assert [f["reason"] for f in result] == ["modified"]
+
+    def test_parse_hashes_file_bytes_in_one_pass(
+        self, temp_cache: iss.CacheManager, temp_dir: Path
+    ) -> None:
+        """The hash folded into parsing matches a standalone hash, CRLF and all."""
+        path = temp_dir / "crlf.jsonl"
+        path.write_bytes(
+            b'{"type": "user", "uuid": "u1", "message": {"content": "caf\xc3\xa9"}}\r\n'
+            b"\r\n"
+            b'{"type": "user", "uuid": "u2"}'
+        )
+        parsed = temp_cache.parse_source_file(
+            {"filepath": str(path), "project_id": "p", "file_type": "main_session"}
+        )
+        assert parsed is not None
+        events, line_count, _session_id, content_hash = parsed
+        assert [e["uuid"] for e in events] == ["u1", "u2"]
+        assert events[0]["message_content"] == "café"
+        assert line_count == 3
+        assert content_hash == iss._file_content_hash(str(path))
+
 
 class TestTraverseAllEdgeCases:
     """Tests for edge cases in traverse --all mode."""
@@ -2565,6 +3244,9 @@ class TestEventEdges:
         cache.update(temp_dir / "projects")
         edge_count_after = cursor.execute("SELECT COUNT(*) FROM event_edges").fetchone()[0]
         assert edge_count_after == 2  # uuid-002→uuid-001 and uuid-003→uuid-002
+        # The single source_files delete cascades to the file's events too.
+        assert cursor.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 3
+        assert cursor.execute("SELECT COUNT(*) FROM source_files").fetchone()[0] == 1
 
 
 class TestTraverseWithCTE:
@@ -2781,7 +3463,7 @@ class TestCompositeIndexes:
             "idx_event_annotations_event",
             "idx_event_annotations_session",
             # Composite indexes on existing tables
-            "idx_events_project_session",
+            "idx_events_rollup_cover",
             "idx_events_session_type",
             "idx_events_session_uuid",
             "idx_source_files_project_session",
@@ -2792,6 +3474,67 @@ class TestCompositeIndexes:
             f"Missing indexes: {expected_new_indexes - indexes}"
         )
 
+    def test_traverse_edge_walk_uses_covering_index(self, temp_cache: iss.CacheManager) -> None:
+        """Session-scoped edge lookups (no project_id) are index-only, not table scans."""
+        conn = temp_cache.conn
+        child = query_plan(conn, "SELECT parent_event_uuid FROM event_edges WHERE session_id = ? AND event_uuid = ?")
+        parent = query_plan(conn, "SELECT event_uuid FROM event_edges WHERE session_id = ? AND parent_event_uuid = ?")
+        assert "COVERING INDEX idx_event_edges_session_child" in child
+        assert "COVERING INDEX idx_event_edges_session_parent" in parent
+
+    def test_traverse_summary_uses_covering_index(self, temp_cache: iss.CacheManager) -> None:
+        """traverse --summary's per-agent GROUP BY is answered from idx_events_session_agent_cover."""
+        plan = query_plan(
+            temp_cache.conn,
+            "SELECT agent_id, agent_slug, MAX(is_sidechain), MIN(timestamp), COUNT(*), "
+            "SUM(billable_tokens), SUM(total_cost_usd) FROM events WHERE session_id = ? GROUP BY agent_id",
+        )
+        assert "COVERING INDEX idx_events_session_agent_cover" in plan
+
+    def test_rollup_rebuild_uses_covering_index(self, temp_cache: iss.CacheManager) -> None:
+        """The projects/sessions rebuild aggregates stream off idx_events_rollup_cover."""
+        plan = query_plan(
+            temp_cache.conn,
+            "SELECT project_id, session_id, MIN(timestamp), COUNT(DISTINCT agent_id), SUM(input_tokens), "
+            "SUM(total_cost_usd) FROM events WHERE session_id IS NOT NULL GROUP BY project_id, session_id",
+        )
+        assert "COVERING INDEX idx_events_rollup_cover" in plan
+
+    def test_prefix_indexes_left_to_covering_indexes(self, temp_cache: iss.CacheManager) -> None:
+        """Project/session lookups use the covering indexes; their prefix twins are gone."""
+        indexes = {row[0] for row in temp_cache.conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert not indexes & {"idx_events_session", "idx_events_project", "idx_events_project_session"}
+        plan = query_plan(temp_cache.conn, "SELECT COUNT(*) FROM events WHERE project_id = ? AND session_id = ?")
+        assert "COVERING INDEX idx_events_rollup_cover" in plan
+
+    def test_sessions_listing_reads_index_in_order(self, temp_cache: iss.CacheManager) -> None:
+        """cmd_sessions' ORDER BY last_timestamp_ms DESC LIMIT is served by an index, not a sort."""
+        plan = query_plan(
+            temp_cache.conn,
+            "SELECT session_id FROM sessions WHERE project_id = ? "
+            "AND last_timestamp_ms >= ? ORDER BY last_timestamp_ms DESC LIMIT ?",
+        )
+        assert "idx_sessions_project_last" in plan
+        assert "TEMP B-TREE" not in plan
+        indexes = {row[0] for row in temp_cache.conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert "idx_sessions_project" not in indexes
+
+    def test_cross_agent_lookups_use_partial_indexes(self, temp_cache: iss.CacheManager) -> None:
+        """Subagent-root and tool_result lookups hit the small partial indexes."""
+        roots = query_plan(
+            temp_cache.conn,
+            "SELECT uuid, prompt_id, agent_id, source_file_id FROM events "
+            "WHERE session_id = ? AND parent_uuid IS NULL AND agent_id IS NOT NULL "
+            "AND is_sidechain = 1 AND prompt_id IS NOT NULL",
+        )
+        tool_results = query_plan(
+            temp_cache.conn,
+            "SELECT parent_uuid FROM events WHERE session_id = ? AND agent_id IS NULL "
+            "AND msg_kind = 'tool_result' AND prompt_id = ? AND parent_uuid IS NOT NULL LIMIT 1",
+        )
+        assert "idx_events_subagent_roots" in roots
+        assert "idx_events_main_tool_results" in tool_results
+
 
 class TestMainDispatchNewTables:
     """Tests for main() dispatch with new tables and flags."""
@@ -3100,6 +3843,23 @@ class TestMainParseArgs:
         assert result.returncode == 0
         assert "introspect_sessions" in result.stdout.lower() or "usage" in result.stdout.lower()
 
+    def test_import_does_not_load_gliner2(self) -> None:
+        """gliner2 (torch) is deferred to the KG NER phase, not module import."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, introspect_sessions; print('gliner2' in sys.modules)",
+            ],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            timeout=30,
+            check=False,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "False"
+
 
 # ============================================================================
 # Message Kind Classification Tests
@@ -3429,6 +4189,85 @@ class TestEventCallsExtraction:
             ("cli", "gh"),
         ]
 
+    def test_ingest_file_dedupes_mirror_and_repeated_uuids(
+        self,
+        temp_dir: Path,
+        temp_cache: iss.CacheManager,
+    ) -> None:
+        """A uuid already cached (mirror path) or repeated in-file is written once."""
+        session_id = "session-s1"
+        project_id = "-Test-Project"
+        lines = [
+            {"type": "user", "uuid": "u1", "timestamp": "2026-01-01T00:00:00Z"},
+            {
+                "type": "assistant",
+                "uuid": "u2",
+                "parentUuid": "u1",
+                "timestamp": "2026-01-01T00:00:01Z",
+                "message": {
+                    "role": "assistant",
+                    "content": [{"type": "tool_use", "name": "Read", "input": {}}],
+                },
+            },
+            {"type": "user", "uuid": "u1", "timestamp": "2026-01-01T00:00:00Z"},
+        ]
+        for sub in ("projects", "mirror"):
+            project_dir = temp_dir / sub / project_id
+            project_dir.mkdir(parents=True)
+            jsonl_path = project_dir / f"{session_id}.jsonl"
+            jsonl_path.write_text("".join(json.dumps(ev) + "\n" for ev in lines))
+            stat_result = jsonl_path.stat()
+            temp_cache.ingest_file(
+                {
+                    "filepath": str(jsonl_path),
+                    "project_id": project_id,
+                    "session_id": session_id,
+                    "file_type": "main_session",
+                    "mtime": stat_result.st_mtime,
+                    "size_bytes": stat_result.st_size,
+                }
+            )
+
+        conn = temp_cache.conn
+        assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 2
+        assert conn.execute("SELECT COUNT(*) FROM event_edges").fetchone()[0] == 1
+        calls = conn.execute(
+            "SELECT e.uuid, c.call_name FROM event_calls c JOIN events e ON e.id = c.event_id"
+        ).fetchall()
+        assert [(r[0], r[1]) for r in calls] == [("u2", "Read")]
+
+
+# ============================================================================
+# Knowledge-graph chunking
+# ============================================================================
+# sync_chunks/chunk_text mirror the backend chunker; these pin the script copy's
+# selection and splitting so it doesn't drift.
+
+
+class TestSyncChunks:
+    """Tests for sync_chunks over human message content."""
+
+    def test_whitespace_only_content_matches_chunk_text(self, populated_cache: iss.CacheManager) -> None:
+        """Blank messages are selected like any other; chunk_text decides what they yield."""
+        conn = populated_cache.conn
+        short_blank = " \n\t "
+        long_blank = " \n\n " * iss.CHUNK_MIN_CHARS
+        conn.execute("UPDATE events SET message_content = ? WHERE uuid = 'uuid-001'", (short_blank,))
+        conn.execute("UPDATE events SET message_content = ? WHERE uuid = 'uuid-005'", (long_blank,))
+        conn.execute("DELETE FROM event_message_chunks")
+        conn.commit()
+
+        iss.sync_chunks(conn)
+
+        rows = conn.execute(
+            "SELECT e.uuid, c.text, c.chunk_offset FROM event_message_chunks c "
+            "JOIN events e ON e.id = c.event_id ORDER BY c.chunk_id"
+        ).fetchall()
+        # A short blank message becomes one chunk (like any short text); a
+        # long one splits into empty paragraphs and yields nothing.
+        assert [(r[0], r[1], r[2]) for r in rows] == [("uuid-001", short_blank, 0)]
+        assert iss.chunk_text(long_blank) == []
+
 
 # ============================================================================
 # Entry Point